@@ -0,0 +1,9 @@
+"""Quantum Pong game logic, importable without opening a window."""
+
+from .simulation import (
+    GameState, INPUT_UP, INPUT_DOWN, INPUT_X, INPUT_Z, INPUT_H,
+)
+
+__all__ = [
+    "GameState", "INPUT_UP", "INPUT_DOWN", "INPUT_X", "INPUT_Z", "INPUT_H",
+]
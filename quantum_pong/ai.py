@@ -0,0 +1,177 @@
+import math
+from collections import deque
+
+from .balls import fold
+from .constants import WIDTH, HEIGHT, BALL_RADIUS, INPUT_UP, INPUT_DOWN
+
+# Dead zone around the paddle center, so the paddle doesn't jitter
+TRACK_DEAD_ZONE = 8
+
+# Predictive opponent settings, from weakest to strongest. speed is px per
+# 60 FPS frame; aim_error is the most the aim point is off, in px; within
+# reach px of the paddle the AI goes for the predicted intercept and
+# farther out it just follows the ball; weigh_branches makes it choose
+# among all superposed branches by their chance of being measured,
+# instead of following the first one on screen.
+AI_LEVELS = {
+    "easy": {"speed": 3, "aim_error": 24, "reach": 240, "weigh_branches": False},
+    "normal": {"speed": 4, "aim_error": 12, "reach": 420, "weigh_branches": True},
+    "hard": {"speed": 5, "aim_error": 4, "reach": WIDTH, "weigh_branches": True},
+    "perfect": {"speed": 6, "aim_error": 0, "reach": WIDTH, "weigh_branches": True},
+}
+
+
+def track_ball(game, paddle=None):
+    """Inputs that keep a paddle (the player's by default) level with the live ball"""
+    paddle = game.player if paddle is None else paddle
+    offset = game.balls.centery(game.active_branch) - paddle.centery
+    if offset < -TRACK_DEAD_ZONE:
+        return INPUT_UP
+    if offset > TRACK_DEAD_ZONE:
+        return INPUT_DOWN
+    return 0
+
+
+def intercept_y(cy, dy, dx, distance):
+    """Center height at which a ball reaches a line `distance` px away along x.
+
+    cy is the ball's center height and (dx, dy) its direction of travel;
+    the walls reflect it on the way. Works on floats or NumPy arrays.
+    """
+    return fold(cy - BALL_RADIUS + dy * (distance / dx), HEIGHT - 2 * BALL_RADIUS) + BALL_RADIUS
+
+
+def _aim_offset(y):
+    # Repeatable "random" in [-1, 1] for an aim point, so the same path
+    # always misses by the same amount
+    return math.sin(y * 12.9898) * 43758.5453 % 1 * 2 - 1
+
+
+class DelayedTracker:
+    """track_ball that reacts to where the ball was `delay` ticks ago.
+
+    With no delay the tracking AI almost never misses, which makes
+    AI-vs-AI matches endless; a human-like reaction time makes them end.
+    """
+
+    def __init__(self, delay=0):
+        self.history = deque(maxlen=delay + 1)
+
+    def __call__(self, game):
+        self.history.append(game.balls.centery(game.active_branch))
+        offset = self.history[0] - game.player.centery
+        if offset < -TRACK_DEAD_ZONE:
+            return INPUT_UP
+        if offset > TRACK_DEAD_ZONE:
+            return INPUT_DOWN
+        return 0
+
+
+class InterceptAI:
+    """Moves a paddle to where the ball will arrive, not where it is.
+
+    The balls fly straight between events, and wall bounces only fold the
+    path, so where each branch crosses the paddle's line is solved in
+    closed form and holds until something turns a ball: a bounce, a paddle
+    hit, a gate, a collapse, Z-noise or the superposed branches appearing.
+    All of those add to game.events, so the solve is redone only after a
+    tick with events and reused otherwise; a tick costs a few compares.
+    Speed changes (jerks) alter when the ball arrives but not where.
+
+    In superposition the first branch to reach a paddle decides the
+    measurement, so the AI covers every incoming branch if the paddle is
+    long enough, aiming at their probability-weighted mean; otherwise it
+    goes for the likeliest branch, the earliest one on ties.
+    """
+
+    def __init__(self, paddle, level="normal"):
+        if level not in AI_LEVELS:
+            raise ValueError(f"unknown AI level {level!r}; choose from {', '.join(AI_LEVELS)}")
+        self.paddle = paddle
+        self.level = level
+        settings = AI_LEVELS[level]
+        self.speed = settings["speed"]
+        self.aim_error = settings["aim_error"]
+        self.reach = settings["reach"]
+        self.weigh_branches = settings["weigh_branches"]
+        # Line the ball's center is on when it touches the paddle, and
+        # which way along x a ball has to move to get there
+        if paddle.centerx > WIDTH / 2:
+            self.line, self.facing = paddle.left - BALL_RADIUS, 1
+        else:
+            self.line, self.facing = paddle.right + BALL_RADIUS, -1
+        self.solves = 0
+        self._frame = None
+        self._events = []
+        self._seen = 0
+        self._revealed = None
+        self._branch = None
+        self._target = HEIGHT / 2
+
+    def _stale(self, game):
+        # Events since the last look: this tick's so far (gates), the rest
+        # of the previous tick's, or a skipped tick (score pause, rewind)
+        return (game.events or len(self._events) > self._seen
+                or game.frame != self._frame + 1 or game.revealed != self._revealed)
+
+    def target(self, game):
+        """Height the paddle's center should head for this tick"""
+        if self._frame is None or self._stale(game):
+            self.solve(game)
+        self._frame = game.frame
+        self._events = game.events
+        self._seen = len(game.events)
+        branch = self._branch
+        if branch is not None and abs(game.balls.x.item(branch) + BALL_RADIUS - self.line) > self.reach:
+            # Too far off to judge yet
+            return game.balls.centery(branch)
+        return self._target
+
+    def solve(self, game):
+        """Work out the aim point from the balls' current paths"""
+        self.solves += 1
+        self._revealed = game.revealed
+        balls = game.balls
+        if game.branch is not None or not self.weigh_branches:
+            branches = [game.active_branch]
+            weights = [1.0]
+        else:
+            branches = balls.on_screen()
+            weights = game.qubit.probabilities()[branches].tolist()
+
+        incoming = []
+        for i, weight in zip(branches, weights):
+            dx = balls.dx.item(i)
+            if dx * self.facing > 0:
+                cy = balls.y.item(i) + BALL_RADIUS
+                distance = self.line - balls.x.item(i) - BALL_RADIUS
+                y = float(intercept_y(cy, balls.dy.item(i), dx, distance))
+                incoming.append((round(weight, 6), -distance / dx, y, i))
+        if not incoming:
+            # Nothing coming: wait in the middle
+            self._branch = None
+            self._target = HEIGHT / 2
+            return
+
+        total = sum(weight for weight, _, _, _ in incoming)
+        mean = sum(weight * y for weight, _, y, _ in incoming) / total if total else incoming[0][2]
+        if all(abs(y - mean) < self.paddle.h / 2 for _, _, y, _ in incoming):
+            target = mean
+            self._branch = max(incoming, key=lambda hit: hit[1])[3]
+        else:
+            _, _, target, self._branch = max(incoming)
+        # Whole pixels, so solving the same path from another point on it
+        # (e.g. after a rollback) gives exactly the same aim
+        target = round(target)
+        target += round(self.aim_error * _aim_offset(target))
+        half = self.paddle.h / 2
+        self._target = min(max(target, half), HEIGHT - half)
+
+    def __call__(self, game):
+        """Inputs toward the target, for driving the player's paddle"""
+        offset = self.target(game) - self.paddle.centery
+        if offset < -TRACK_DEAD_ZONE:
+            return INPUT_UP
+        if offset > TRACK_DEAD_ZONE:
+            return INPUT_DOWN
+        return 0
@@ -0,0 +1,244 @@
+"""The windowed game: startup, main loop and shutdown.
+
+Importing this module only defines things; nothing is initialized until
+main() runs. Startup brings up just the pygame subsystems the game uses
+(display and font) and times each phase up to the first presented frame.
+"""
+import os
+import sys
+import time
+
+import pygame
+
+from .constants import (
+    WIDTH, HEIGHT, TICK_RATE, FRAME_RATE, MAX_FRAME_TIME, REPLAY_DIR, PROFILE_DIR,
+    CAPTURE_DIR, METRICS_PORT, FONT_FAMILY, FONT_SIZE, SMALL_FONT_SIZE,
+)
+from .capture import FrameCapture
+from .controls import GateKeys
+from .eventlog import EventLog
+from .fonts import load_font
+from .metrics import GameMetrics, MetricsServer
+from .profiler import FrameProfiler
+from .quality import QualityGovernor
+from .render import Renderer
+from .replay import ReplayRecorder
+from .simulation import GameState, PLAYING, INPUT_UP, INPUT_DOWN, INPUT_X, INPUT_Z, INPUT_H
+
+
+class StartupTimer:
+    """Milliseconds spent in each startup phase, from `started` onwards"""
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self._last = self.started
+        self.phases = {}
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = (now - self._last) * 1000
+        self._last = now
+
+    def report(self):
+        entry = {"event": "startup"}
+        entry.update((f"{phase}_ms", round(ms, 2)) for phase, ms in self.phases.items())
+        entry["total_ms"] = round((self._last - self.started) * 1000, 2)
+        return entry
+
+
+class App:
+    def __init__(self, started=None, net=None):
+        timer = self.startup = StartupTimer(started)
+        timer.mark("imports")
+
+        # Only what the game uses; pygame.init() would also start audio,
+        # joysticks and the rest
+        pygame.display.init()
+        pygame.font.init()
+        timer.mark("pygame")
+
+        # 32-bit whatever the desktop runs at, the layout frame capture reads
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), depth=32)
+        pygame.display.set_caption("Quantum Pong with Gate Power-Ups")
+        self.clock = pygame.time.Clock()
+        timer.mark("display")
+
+        self.font = load_font(FONT_FAMILY, FONT_SIZE)
+        self.small_font = load_font(FONT_FAMILY, SMALL_FONT_SIZE)
+        timer.mark("fonts")
+
+        # All gameplay state lives in the headless simulation. In versus
+        # mode `net` steps it instead (see quantum_pong.net); the other
+        # player's inputs live on the other cabinet, so there is no replay.
+        self.net = net
+        if net is None:
+            self.game = GameState(tick_rate=TICK_RATE)
+            self.recorder = ReplayRecorder(self.game.seed, TICK_RATE, self.game.branches,
+                                           self.game.ai_level)
+        else:
+            self.game = net.game
+            self.recorder = None
+        timer.mark("simulation")
+
+        # Effects scale up or down to keep each frame's work within budget
+        self.governor = QualityGovernor()
+        self.renderer = Renderer(self.screen, self.font, self.small_font,
+                                 quality=self.governor.settings)
+        timer.mark("renderer")
+
+        # Phase timings for the F3 overlay, written to PROFILE_DIR on exit
+        self.profiler = FrameProfiler()
+        self.game.lap = self.profiler.lap
+        self.renderer.profiler = self.profiler
+
+        # Gates fire on key presses; gameplay events go to stdout off the main thread
+        self.gate_keys = GateKeys({pygame.K_x: INPUT_X, pygame.K_z: INPUT_Z, pygame.K_h: INPUT_H})
+        self.event_log = EventLog(sys.stdout)
+
+        # F9 streams the frames to CAPTURE_DIR from a writer thread
+        self.capture = None
+
+        # Counters for fleet monitoring, scraped from a localhost endpoint
+        self.metrics = GameMetrics(self.game.tick_rate)
+        self.metrics.quality_tier.set(self.governor.tier)
+        self.metrics_server = None
+        if METRICS_PORT is not None:
+            try:
+                self.metrics_server = MetricsServer(self.metrics, METRICS_PORT)
+            except OSError as error:
+                # Most likely another instance has the port
+                self.event_log.log({"event": "metrics_unavailable", "port": METRICS_PORT,
+                                    "error": str(error)})
+        timer.mark("metrics")
+
+    def read_movement(self):
+        keys = pygame.key.get_pressed()
+        inputs = 0
+        if keys[pygame.K_UP]:
+            inputs |= INPUT_UP
+        if keys[pygame.K_DOWN]:
+            inputs |= INPUT_DOWN
+        return inputs
+
+    def toggle_capture(self):
+        capture = self.capture
+        if capture is None:
+            path = os.path.join(CAPTURE_DIR, time.strftime("%Y%m%d-%H%M%S"))
+            self.capture = FrameCapture(path, (WIDTH, HEIGHT), FRAME_RATE)
+            self.event_log.log({"event": "capture", "frame": self.game.frame, "path": path})
+        else:
+            capture.stop()
+            self.capture = None
+            self.event_log.log({"event": "capture_end", "frame": self.game.frame,
+                                "path": capture.directory, "frames": capture.frames,
+                                "dropped": capture.dropped})
+
+    def handle_events(self, events):
+        """Turn simulation events into effects and log entries"""
+        self.renderer.apply_events(events)
+        self.event_log.record(self.game.frame, events)
+        self.metrics.record(events, self.game.phase == PLAYING)
+
+    def run(self):
+        game, renderer, profiler, gate_keys = self.game, self.renderer, self.profiler, self.gate_keys
+        clock = self.clock
+        tick_time = 1 / game.tick_rate
+        step = game.step if self.net is None else self.net.tick
+        recorder = self.recorder
+
+        running = True
+        accumulator = 0.0
+        gate_inputs = 0
+        first_frame = True
+        while running:
+            # Real time since the last frame, capped so a stall can't snowball
+            frame_time = min(clock.tick(FRAME_RATE) / 1000, MAX_FRAME_TIME)
+            accumulator += frame_time
+            profiler.lap("tick_wait")
+            work_start = time.perf_counter()
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        profiler.visible = not profiler.visible
+                    elif event.key == pygame.K_F9:
+                        self.toggle_capture()
+                    else:
+                        gate_keys.key_down(event.key, pygame.time.get_ticks())
+                elif event.type == pygame.KEYUP:
+                    gate_keys.key_up(event.key)
+                elif event.type == pygame.WINDOWFOCUSLOST:
+                    gate_keys.release_all()
+
+            # Paddles, AI, power-ups, ball physics, collapse and scoring at a fixed rate
+            movement = self.read_movement()
+            # Gate presses wait for the next tick, even on frames that run none
+            gate_inputs |= gate_keys.poll(pygame.time.get_ticks())
+            profiler.lap("input")
+            while accumulator >= tick_time:
+                inputs = movement | gate_inputs
+                gate_inputs = 0
+                if recorder is not None:
+                    recorder.record(inputs)
+                self.handle_events(step(inputs))
+                profiler.lap("events")
+                accumulator -= tick_time
+
+            # Draw changed regions, blended between the last two ticks
+            renderer.draw(game, accumulator / tick_time, frame_time * 60)
+            renderer.present()
+            profiler.lap("flip")
+            if self.capture is not None:
+                self.capture.grab(self.screen)
+                profiler.lap("capture")
+            profiler.end_frame(renderer.allocations)
+
+            work_ms = (time.perf_counter() - work_start) * 1000
+            self.metrics.frame_seconds.observe(work_ms / 1000)
+            if self.governor.update(work_ms) is not None:
+                renderer.set_quality(self.governor.settings)
+                self.metrics.quality_tier.set(self.governor.tier)
+                self.event_log.log({"event": "quality", "frame": game.frame,
+                                    "tier": self.governor.name, "work_ms": round(work_ms, 2)})
+
+            if first_frame:
+                first_frame = False
+                self.startup.mark("first_frame")
+                self.event_log.log(self.startup.report())
+
+    def shutdown(self):
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+        if self.capture is not None:
+            self.capture.close()
+            print(f"Capture saved to {self.capture.directory}")
+        pygame.quit()
+        self.event_log.close()
+        if self.net is not None:
+            self.net.close()
+
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if self.recorder is not None:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            replay_path = os.path.join(REPLAY_DIR, f"{stamp}.qpr")
+            self.recorder.save(replay_path, self.game)
+            print(f"Replay saved to {replay_path}")
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profile_path = os.path.join(PROFILE_DIR, f"{stamp}.csv")
+        self.profiler.export_csv(profile_path)
+        print(f"Frame profile saved to {profile_path}")
+
+
+def main(started=None, net=None):
+    """Run the game; `started` is a perf_counter() reading from process start.
+
+    `net` is a quantum_pong.net Host or connected Client for versus mode.
+    """
+    app = App(started, net)
+    try:
+        app.run()
+    finally:
+        app.shutdown()
@@ -0,0 +1,100 @@
+"""Every branch of a superposed ball, in packed arrays.
+
+The ball has one branch per basis state of the game's qubit register, so
+k qubits give 2**k branches. Branch i's position, velocity and flags sit
+at index i of a few NumPy arrays, and the simulation and renderer handle
+every branch in one loop over on_screen(). More branches cost linearly
+more time, and no code is written out per ball.
+"""
+import numpy as np
+
+from .constants import WIDTH, HEIGHT, BALL_RADIUS
+
+# How far split branches appear from the ball they split from
+SPLIT_OFFSET_X = 40
+SPLIT_OFFSET_Y = 30
+
+BALL_SIZE = BALL_RADIUS * 2
+
+
+def fold(values, limit):
+    """Reflect values into [0, limit], the way a ball bounces between two walls"""
+    values = np.mod(values, 2 * limit)
+    return np.where(values > limit, 2 * limit - values, values)
+
+
+class BallSet:
+    def __init__(self, count):
+        self.count = count
+        # Top-left corners and per-frame velocities
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.dx = np.zeros(count)
+        self.dy = np.zeros(count)
+        # Branches with amplitude, and which of those are on screen; change
+        # `visible` through show() so on_screen() stays in step
+        self.alive = np.zeros(count, dtype=bool)
+        self.visible = np.zeros(count, dtype=bool)
+        self._on_screen = []
+
+    def __len__(self):
+        return self.count
+
+    def on_screen(self):
+        """Indices of the visible branches, lowest first; don't modify the list"""
+        return self._on_screen
+
+    def show(self, indices):
+        """Put exactly these branches on screen"""
+        self._on_screen = sorted(indices)
+        self.visible[:] = False
+        self.visible[self._on_screen] = True
+
+    def show_alive(self):
+        self.show(np.flatnonzero(self.alive).tolist())
+
+    def position(self, i):
+        return self.x.item(i), self.y.item(i)
+
+    def centery(self, i):
+        return self.y.item(i) + BALL_RADIUS
+
+    def serve(self, dx, dy):
+        """Line the branches up on the center line with alternating vertical directions.
+
+        Only branch 0 is on screen; the rest appear after the serve delay.
+        """
+        count = self.count
+        self.x[:] = WIDTH // 2
+        self.y[:] = np.arange(1, count + 1) * HEIGHT // (count + 1)
+        self.dx[:] = dx
+        self.dy[:] = dy
+        self.dy[1::2] = -dy
+        self.show([0])
+
+    def split(self, source):
+        """Fan the branches out from branch `source`, which moves to branch 0.
+
+        Branch 0 keeps the source's place. The others line up on a column
+        ahead of it, alternating below and above, and moving vertically in
+        alternating directions.
+        """
+        x, y = self.position(source)
+        dx, dy = float(self.dx[source]), float(self.dy[source])
+        offset_x = SPLIT_OFFSET_X if x < WIDTH // 2 else -SPLIT_OFFSET_X
+        offset_y = SPLIT_OFFSET_Y if y < HEIGHT // 2 else -SPLIT_OFFSET_Y
+
+        branch = np.arange(self.count)
+        # 0, +1, -1, +2, -2, ... steps from the source, toward the middle first
+        steps = (branch + 1) // 2 * np.where(branch % 2, 1, -1)
+        self.x[:] = min(max(x + offset_x, 0), WIDTH - BALL_SIZE)
+        self.x[0] = x
+        self.y[:] = fold(y + offset_y * steps, HEIGHT - BALL_SIZE)
+        self.dx[:] = dx
+        self.dy[:] = dy
+        self.dy[1::2] = -dy
+
+    def copy(self, source, target):
+        """Put branch `target` where branch `source` is, moving the same way"""
+        for array in (self.x, self.y, self.dx, self.dy):
+            array[target] = array[source]
@@ -0,0 +1,297 @@
+import numpy as np
+
+from .constants import (
+    WIDTH, HEIGHT, BALL_RADIUS, PADDLE_WIDTH, PADDLE_HEIGHT, BASE_SPEED,
+    JERK_SPEED, JERK_DURATION, DELAY_FRAMES, Z_NOISE_INTERVAL, Z_NOISE_CHANCE,
+    MEASUREMENT_TIMEOUT, PLAYER_SPEED, OPPONENT_SPEED, AI_LEVEL,
+    INPUT_UP, INPUT_DOWN, INPUT_X, INPUT_Z, INPUT_H,
+)
+from .ai import AI_LEVELS, intercept_y
+
+# Values of BatchSimulator.state
+STATE_0 = 0
+STATE_1 = 1
+SUPERPOSITION = 2
+
+BALL_SIZE = BALL_RADIUS * 2
+PLAYER_X = 20
+OPPONENT_X = WIDTH - 30
+
+
+class BatchSimulator:
+    """N independent matches stored as struct-of-arrays and stepped in lockstep.
+
+    Models the ball rules GameState had before its fixed-timestep physics
+    and qubit register (walls, paddle hits, collapse on paddle contact or
+    MEASUREMENT_TIMEOUT, jerks, Z-noise, scoring) with every branch turned
+    into a mask: two branches, collisions tested at each tick's end point
+    rather than swept, H always splitting the ball in two with no
+    interference, and timeouts picking either branch with even odds.
+    Positions are floats rather than whole pixels, and power-ups are left
+    out, so batch outcomes are statistics of that game, not GameState's.
+
+    In the classical states the live ball is always kept in ball 0's arrays;
+    `state` only records whether it is |0> or |1>.
+
+    ai_level picks the opponent like GameState's: "classic" follows ball 0,
+    the AI_LEVELS aim at the intercept, solved for every match at once.
+    """
+
+    def __init__(self, n, seed=None, player_ai=True, ai_level=AI_LEVEL):
+        if ai_level != "classic" and ai_level not in AI_LEVELS:
+            raise ValueError(f"unknown AI level {ai_level!r}")
+        self.n = n
+        self.player_ai = player_ai
+        self.ai_level = ai_level
+        # Opponent aim per match, and the ball directions it was solved for
+        self._aim = None
+        self._aim_key = None
+        self.rng = np.random.default_rng(seed)
+        self.frame = 0
+
+        self.b0x = np.empty(n)
+        self.b0y = np.empty(n)
+        self.b1x = np.empty(n)
+        self.b1y = np.empty(n)
+        self.dx = np.empty(n)
+        self.dy = np.empty(n)
+        self.dy1 = np.empty(n)
+        self.state = np.empty(n, dtype=np.int8)
+        self.ball_1_visible = np.empty(n, dtype=bool)
+        self.delay_counter = np.empty(n, dtype=np.int32)
+        self.measurement_timer = np.empty(n, dtype=np.int32)
+        self.jerk_timer = np.empty(n, dtype=np.int32)
+        self.z_noise_timer = np.empty(n, dtype=np.int32)
+
+        self.player_y = np.full(n, HEIGHT // 2 - PADDLE_HEIGHT // 2, dtype=np.float64)
+        self.opponent_y = self.player_y.copy()
+        self.player_score = np.zeros(n, dtype=np.int32)
+        self.opponent_score = np.zeros(n, dtype=np.int32)
+
+        # Per-match counters for balance studies
+        self.paddle_hits = np.zeros(n, dtype=np.int64)
+        self.collapses = np.zeros(n, dtype=np.int64)
+        self.timeout_collapses = np.zeros(n, dtype=np.int64)
+        self.z_noise_flips = np.zeros(n, dtype=np.int64)
+
+        self.reset_rounds(np.ones(n, dtype=bool))
+
+    def reset_rounds(self, mask):
+        """Start a new round in every match selected by the boolean mask"""
+        count = int(np.count_nonzero(mask))
+        if not count:
+            return
+        self.b0x[mask] = WIDTH // 2
+        self.b0y[mask] = HEIGHT // 3
+        self.b1x[mask] = WIDTH // 2
+        self.b1y[mask] = 2 * HEIGHT // 3
+
+        angle = self.rng.uniform(-0.6, 0.6, count)
+        direction = self.rng.choice(np.array([-1.0, 1.0]), count)
+        self.dx[mask] = BASE_SPEED * direction
+        self.dy[mask] = BASE_SPEED * np.sin(angle)
+        self.dy1[mask] = -self.dy[mask]
+
+        self.state[mask] = SUPERPOSITION
+        self.ball_1_visible[mask] = False
+        self.delay_counter[mask] = 0
+        self.measurement_timer[mask] = 0
+        self.jerk_timer[mask] = 0
+        self.z_noise_timer[mask] = 0
+
+    def _hits_paddle(self, x, y):
+        # Ball box against both paddle boxes, same test as Box.colliderect
+        rows = (y < self.player_y + PADDLE_HEIGHT) & (self.player_y < y + BALL_SIZE)
+        hit_player = rows & (x < PLAYER_X + PADDLE_WIDTH) & (PLAYER_X < x + BALL_SIZE)
+        rows = (y < self.opponent_y + PADDLE_HEIGHT) & (self.opponent_y < y + BALL_SIZE)
+        hit_opponent = rows & (x < OPPONENT_X + PADDLE_WIDTH) & (OPPONENT_X < x + BALL_SIZE)
+        return hit_player | hit_opponent
+
+    @staticmethod
+    def _track(paddle_y, target_y, speed):
+        # Move a paddle `speed` px toward target_y, staying on screen
+        center = paddle_y + PADDLE_HEIGHT // 2
+        down = (center < target_y) & (paddle_y + PADDLE_HEIGHT < HEIGHT)
+        up = ~down & (center > target_y) & (paddle_y > 0)
+        paddle_y += speed * down
+        paddle_y -= speed * up
+
+    def _intercept_target(self):
+        # InterceptAI's aim for every match, re-solved only in matches where
+        # a ball turned or the state changed since the last solve
+        settings = AI_LEVELS[self.ai_level]
+        line = OPPONENT_X - BALL_RADIUS
+        key = ((self.dx > 0) | (self.dy > 0) << 1 | (self.dy1 > 0) << 2 |
+               self.ball_1_visible << 3).astype(np.int8) | self.state << 4
+        if self._aim is None:
+            self._aim = np.empty(self.n)
+            stale = np.arange(self.n)
+        else:
+            stale = np.flatnonzero(key != self._aim_key)
+        self._aim_key = key
+        if len(stale):
+            self._aim[stale] = self._solve(stale, settings, line)
+        # Far off it follows the ball
+        far = line - self.b0x - BALL_RADIUS > settings["reach"]
+        return np.where(far, self.b0y + BALL_RADIUS, self._aim)
+
+    def _solve(self, index, settings, line):
+        # Both branches are equally likely here, so the AI covers both if
+        # it can, else the one that arrives first
+        dx = self.dx[index]
+        incoming = dx > 0
+        dx = np.where(incoming, dx, 1.0)
+        y0 = intercept_y(self.b0y[index] + BALL_RADIUS, self.dy[index], dx,
+                         line - self.b0x[index] - BALL_RADIUS)
+        target = y0
+        if settings["weigh_branches"]:
+            both = (self.state[index] == SUPERPOSITION) & self.ball_1_visible[index]
+            y1 = intercept_y(self.b1y[index] + BALL_RADIUS, self.dy1[index], dx,
+                             line - self.b1x[index] - BALL_RADIUS)
+            covered = np.abs(y1 - y0) < PADDLE_HEIGHT
+            target = np.where(both & covered, (y0 + y1) / 2,
+                              np.where(both & (self.b1x[index] > self.b0x[index]), y1, y0))
+        target = np.rint(target)
+        target += np.rint(settings["aim_error"] * (np.sin(target * 12.9898) * 43758.5453 % 1 * 2 - 1))
+        target = np.clip(target, PADDLE_HEIGHT / 2, HEIGHT - PADDLE_HEIGHT / 2)
+        # With nothing coming it waits mid-court
+        return np.where(incoming, target, HEIGHT / 2)
+
+    def _apply_gates(self, inputs):
+        classical = self.state != SUPERPOSITION
+
+        x_gate = (inputs & INPUT_X).astype(bool) & classical
+        if x_gate.any():
+            self.state[x_gate] ^= 1
+            self.dx[x_gate] *= -1
+            self.jerk_timer[x_gate] = JERK_DURATION
+
+        z_gate = (inputs & INPUT_Z).astype(bool) & ~classical
+        self.dy[z_gate] *= -1
+
+        h_gate = (inputs & INPUT_H).astype(bool)
+        if h_gate.any():
+            x = self.b0x[h_gate]
+            y = self.b0y[h_gate]
+            self.b1x[h_gate] = np.clip(x + np.where(x < WIDTH // 2, 40, -40), 0, WIDTH - BALL_SIZE)
+            self.b1y[h_gate] = np.clip(y + np.where(y < HEIGHT // 2, 30, -30), 0, HEIGHT - BALL_SIZE)
+            self.dy1[h_gate] = -self.dy[h_gate]
+            self.state[h_gate] = SUPERPOSITION
+            self.ball_1_visible[h_gate] = True
+            self.delay_counter[h_gate] = DELAY_FRAMES
+            self.measurement_timer[h_gate] = 0
+
+    def step(self, inputs=None):
+        """Advance every match by one frame.
+
+        inputs is an optional uint8 array of per-match input bits for the
+        player paddle; with player_ai the player tracks the ball like the
+        opponent does whenever no inputs are given.
+        """
+        self.frame += 1
+        if inputs is not None:
+            inputs = np.asarray(inputs)
+            moves = inputs & (INPUT_UP | INPUT_DOWN)
+            self.player_y -= PLAYER_SPEED * ((moves == INPUT_UP) & (self.player_y > 0))
+            self.player_y += PLAYER_SPEED * ((moves == INPUT_DOWN) &
+                                             (self.player_y + PADDLE_HEIGHT < HEIGHT))
+            if (inputs & (INPUT_X | INPUT_Z | INPUT_H)).any():
+                self._apply_gates(inputs)
+
+        # Paddle AI tracks ball 0, which is also the live ball in |0> and |1>
+        target_y = self.b0y + BALL_RADIUS
+        if self.ai_level == "classic":
+            self._track(self.opponent_y, target_y, OPPONENT_SPEED)
+        else:
+            self._track(self.opponent_y, self._intercept_target(), AI_LEVELS[self.ai_level]["speed"])
+        if inputs is None and self.player_ai:
+            self._track(self.player_y, target_y, OPPONENT_SPEED)
+
+        sup = self.state == SUPERPOSITION
+        classical = ~sup
+        self._step_superposition(sup)
+        self._step_classical(classical)
+
+    def _step_superposition(self, sup):
+        if not sup.any():
+            return
+        dx, dy, dy1 = self.dx, self.dy, self.dy1
+
+        self.b0x += dx * sup
+        self.b0y += dy * sup
+        wall = sup & ((self.b0y <= 0) | (self.b0y + BALL_SIZE >= HEIGHT))
+        dy[wall] *= -1
+        hit_0 = sup & self._hits_paddle(self.b0x, self.b0y)
+        dx[hit_0] *= -1
+
+        visible = sup & self.ball_1_visible
+        self.b1x += dx * visible
+        self.b1y += dy1 * visible
+        wall = visible & ((self.b1y <= 0) | (self.b1y + BALL_SIZE >= HEIGHT))
+        dy1[wall] *= -1
+        hit_1 = visible & self._hits_paddle(self.b1x, self.b1y)
+        dx[hit_1] *= -1
+
+        waiting = sup & ~self.ball_1_visible
+        self.delay_counter += waiting
+        self.ball_1_visible |= waiting & (self.delay_counter > DELAY_FRAMES)
+
+        # Collapse on paddle contact, else auto-measure on timeout
+        self.measurement_timer += sup
+        to_0 = hit_0
+        to_1 = ~hit_0 & sup & self.ball_1_visible & self._hits_paddle(self.b1x, self.b1y)
+        timeout = sup & ~to_0 & ~to_1 & (self.measurement_timer > MEASUREMENT_TIMEOUT)
+        coin = self.rng.random(self.n) < 0.5
+        to_1 |= timeout & coin
+        to_0 |= timeout & ~coin
+
+        collapsed = to_0 | to_1
+        if collapsed.any():
+            self.state[to_0] = STATE_0
+            self.state[to_1] = STATE_1
+            self.b0x[to_1] = self.b1x[to_1]
+            self.b0y[to_1] = self.b1y[to_1]
+            self.jerk_timer[collapsed] = JERK_DURATION
+            self.ball_1_visible[collapsed] = False
+            self.collapses += collapsed
+            self.timeout_collapses += timeout
+            self.paddle_hits += collapsed & ~timeout
+
+    def _step_classical(self, classical):
+        if not classical.any():
+            return
+        dx, dy = self.dx, self.dy
+
+        self.b0x += dx * classical
+        self.b0y += dy * classical
+        wall = classical & ((self.b0y <= 0) | (self.b0y + BALL_SIZE >= HEIGHT))
+        dy[wall] *= -1
+        hit = classical & self._hits_paddle(self.b0x, self.b0y)
+        dx[hit] *= -1
+        self.paddle_hits += hit
+
+        # Normalize dx, dy with current speed
+        jerking = classical & (self.jerk_timer > 0)
+        speed = np.where(jerking, JERK_SPEED, BASE_SPEED)
+        self.jerk_timer -= jerking
+        angle = np.arctan2(dy, dx)
+        np.copyto(dx, speed * np.cos(angle), where=classical)
+        np.copyto(dy, speed * np.sin(angle), where=classical)
+
+        self.z_noise_timer += classical
+        noise = classical & (self.z_noise_timer > Z_NOISE_INTERVAL)
+        if noise.any():
+            flip = noise & (self.rng.random(self.n) < Z_NOISE_CHANCE)
+            dy[flip] *= -1
+            self.z_noise_flips += flip
+            self.z_noise_timer[noise] = 0
+
+        player_point = classical & (self.b0x + BALL_SIZE >= WIDTH)
+        opponent_point = classical & ~player_point & (self.b0x <= 0)
+        self.player_score += player_point
+        self.opponent_score += opponent_point
+        self.reset_rounds(player_point | opponent_point)
+
+    def run(self, frames, inputs=None):
+        for _ in range(frames):
+            self.step(inputs)
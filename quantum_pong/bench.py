@@ -0,0 +1,296 @@
+"""Headless benchmark suite for the simulation and renderer.
+
+Each scenario drives a real GameState and Renderer on SDL's dummy video
+driver, one display frame at a time with the same tick/draw/present order
+as the game loop, and measures frames per second, frame time percentiles,
+peak process memory and surface allocations per frame. Every scenario runs
+in a fresh process so its peak memory is its own.
+
+The "headless" scenario steps a GameState with no display at all and
+reports ticks per second; below MIN_TICKS_PER_SECOND it fails on any
+machine, baseline or not, since soak tests depend on it.
+
+    python -m quantum_pong.bench                  # run and compare to the baseline
+    python -m quantum_pong.bench --save-baseline  # record a new baseline
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from .constants import (
+    WIDTH, HEIGHT, TICK_RATE, FRAME_RATE, NEON_PINK, YELLOW, FONT_FAMILY, FONT_SIZE,
+    SMALL_FONT_SIZE, MAX_BRANCHES,
+)
+from .ai import track_ball
+from .simulation import INPUT_UP, INPUT_DOWN, INPUT_X, INPUT_Z, INPUT_H
+
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+DEFAULT_FRAMES = 600
+
+# Each scenario runs this many times and keeps its best value per metric,
+# which filters out most scheduler and turbo-clock noise
+DEFAULT_REPEATS = 3
+
+# A metric this much worse than the baseline is reported as a regression
+TOLERANCE = 0.25
+
+# The headless scenario's length, and the step rate it must reach
+HEADLESS = "headless"
+HEADLESS_TICKS = 60000
+MIN_TICKS_PER_SECOND = 50000
+
+# Metric name -> True if bigger is better
+METRICS = {
+    "fps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "peak_mb": False,
+    "allocations_per_frame": False,
+    "ticks_per_s": True,
+}
+
+# Baselines this small are noise, so they get an absolute allowance instead
+MIN_DIFFERENCE = {"p50_ms": 0.05, "p95_ms": 0.1, "p99_ms": 0.2, "peak_mb": 2.0,
+                  "allocations_per_frame": 0.5}
+
+
+def rally(game, renderer, frame):
+    return track_ball(game)
+
+
+def superposition(game, renderer, frame):
+    # Re-apply H as soon as the ball collapses, so both balls and trails stay up
+    return track_ball(game) | (INPUT_H if game.ball_state != "superposition" else 0)
+
+
+def particle_storm(game, renderer, frame):
+    # Far more bursts than the pool holds, so it stays saturated
+    for i in range(8):
+        renderer.create_explosion((frame * 37 + i * 101) % WIDTH, (frame * 53 + i * 67) % HEIGHT,
+                                  NEON_PINK if i % 2 else YELLOW, 64)
+    return track_ball(game)
+
+
+def powerup_storm_setup(game, renderer):
+    game.gate_drop_interval = 4
+
+
+def branches_setup(game, renderer):
+    game.set_branches(MAX_BRANCHES)
+
+
+def gate_spam(game, renderer, frame):
+    return track_ball(game) | (INPUT_X, INPUT_Z, INPUT_H)[frame % 3]
+
+
+# name -> (setup(game, renderer) or None, inputs(game, renderer, frame))
+SCENARIOS = {
+    "rally": (None, rally),
+    "superposition": (None, superposition),
+    "particle_storm": (None, particle_storm),
+    "powerup_storm": (powerup_storm_setup, rally),
+    "gate_spam": (None, gate_spam),
+    "branches": (branches_setup, superposition),
+}
+
+
+def peak_memory_mb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def run_scenario(name, frames=DEFAULT_FRAMES, seed=1):
+    """Play one scenario for `frames` display frames and return its metrics"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+
+    from .fonts import load_font
+    from .render import Renderer
+    from .simulation import GameState
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), depth=32)
+    font = load_font(FONT_FAMILY, FONT_SIZE)
+    small_font = load_font(FONT_FAMILY, SMALL_FONT_SIZE)
+
+    setup, inputs_for = SCENARIOS[name]
+    game = GameState(seed=seed, tick_rate=TICK_RATE)
+    renderer = Renderer(screen, font, small_font, seed=seed)
+    if setup is not None:
+        setup(game, renderer)
+    ticks_per_frame = max(1, TICK_RATE // FRAME_RATE)
+
+    clock = time.perf_counter
+    frame_times = []
+    allocations_before = renderer.allocations
+    start = clock()
+    for frame in range(frames):
+        frame_start = clock()
+        pygame.event.pump()
+        inputs = inputs_for(game, renderer, frame)
+        for _ in range(ticks_per_frame):
+            renderer.apply_events(game.step(inputs))
+            inputs &= INPUT_UP | INPUT_DOWN
+        renderer.draw(game)
+        renderer.present()
+        frame_times.append(clock() - frame_start)
+    elapsed = clock() - start
+    allocations = renderer.allocations - allocations_before
+    pygame.quit()
+
+    frame_times.sort()
+    return {
+        "frames": frames,
+        "fps": frames / elapsed,
+        "p50_ms": percentile(frame_times, 0.50) * 1000,
+        "p95_ms": percentile(frame_times, 0.95) * 1000,
+        "p99_ms": percentile(frame_times, 0.99) * 1000,
+        "peak_mb": peak_memory_mb(),
+        "allocations_per_frame": allocations / frames,
+    }
+
+
+def run_headless(ticks=HEADLESS_TICKS, seed=1):
+    """Step a GameState with no display, the player tracking the ball; returns ticks per second"""
+    from .simulation import GameState
+
+    game = GameState(seed=seed, tick_rate=TICK_RATE)
+    step = game.step
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(ticks):
+        step(track_ball(game))
+    return {"ticks": ticks, "ticks_per_s": ticks / (clock() - start)}
+
+
+def _run_isolated(args):
+    name, frames = args
+    if name == HEADLESS:
+        return run_headless()
+    return run_scenario(name, frames)
+
+
+def best_of(runs):
+    """Merge repeated runs of a scenario, keeping the best value of each metric"""
+    merged = dict(runs[0])
+    for metric, higher_is_better in METRICS.items():
+        values = [run[metric] for run in runs if run.get(metric) is not None]
+        if values:
+            merged[metric] = max(values) if higher_is_better else min(values)
+    return merged
+
+
+def run_suite(names, frames=DEFAULT_FRAMES, repeats=DEFAULT_REPEATS):
+    """Run scenarios, each run in a fresh process, and return {name: metrics}"""
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in names:
+        runs = []
+        for _ in range(repeats):
+            with context.Pool(1) as pool:
+                runs.append(pool.apply(_run_isolated, ((name, frames),)))
+        results[name] = best_of(runs)
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Regressions as (scenario, metric, baseline value, new value) tuples"""
+    regressions = []
+    for name, metrics in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = reference.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            allowance = max(abs(old) * tolerance, MIN_DIFFERENCE.get(metric, 0))
+            worse = old - new if higher_is_better else new - old
+            if worse > allowance:
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def format_results(results, baseline):
+    lines = [f"{'scenario':<16}{'fps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+             f"{'peak MB':>9}{'allocs/f':>10}"]
+    for name, m in results.items():
+        if name == HEADLESS:
+            lines.append(f"{name:<16}{m['ticks_per_s']:>9.0f} ticks/s")
+            if name in baseline:
+                lines.append(f"{'  baseline':<16}{baseline[name]['ticks_per_s']:>9.0f} ticks/s")
+            continue
+        peak = f"{m['peak_mb']:.1f}" if m["peak_mb"] is not None else "-"
+        lines.append(f"{name:<16}{m['fps']:>9.1f}{m['p50_ms']:>9.2f}{m['p95_ms']:>9.2f}"
+                     f"{m['p99_ms']:>9.2f}{peak:>9}{m['allocations_per_frame']:>10.2f}")
+        reference = baseline.get(name)
+        if reference:
+            lines.append(f"{'  baseline':<16}{reference['fps']:>9.1f}{reference['p50_ms']:>9.2f}"
+                         f"{reference['p95_ms']:>9.2f}{reference['p99_ms']:>9.2f}"
+                         f"{reference.get('peak_mb') or 0:>9.1f}"
+                         f"{reference['allocations_per_frame']:>10.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quantum_pong.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"scenarios to run: {', '.join(SCENARIOS)}, {HEADLESS} (default: all)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="display frames per scenario")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="runs per scenario, best kept")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="relative slowdown allowed before a metric is flagged")
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or list(SCENARIOS) + [HEADLESS]
+    unknown = [name for name in names if name not in SCENARIOS and name != HEADLESS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+    results = run_suite(names, args.frames, args.repeats)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(format_results(results, {} if args.save_baseline else baseline))
+
+    if args.save_baseline:
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, metric, old, new in regressions:
+        print(f"REGRESSION {name}.{metric}: {old:.2f} -> {new:.2f}")
+    too_slow = HEADLESS in results and results[HEADLESS]["ticks_per_s"] < MIN_TICKS_PER_SECOND
+    if too_slow:
+        print(f"TOO SLOW {HEADLESS}: {results[HEADLESS]['ticks_per_s']:.0f} ticks/s, "
+              f"needs {MIN_TICKS_PER_SECOND}")
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+    return 1 if regressions or too_slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
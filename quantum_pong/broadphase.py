@@ -0,0 +1,101 @@
+"""Uniform-grid spatial hash used as the collision broadphase.
+
+Falling power-ups register their bounding boxes once and are re-filed only
+when they cross into a different set of cells, so a frame of movement is
+usually a tuple compare. A query returns whatever is filed in the cells a
+box touches, and the exact narrow-phase tests run on those candidates
+only. GameState queries it once enough power-ups are falling to pay for
+the lookup; the two paddles are always tested directly.
+"""
+
+# Cell edge in pixels: a bit larger than a power-up so most objects span 1-4 cells
+CELL_SIZE = 64
+
+
+class SpatialHash:
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self._ranges = {}
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __contains__(self, obj):
+        return obj in self._ranges
+
+    def _cell_range(self, left, top, right, bottom):
+        # Float cell indices hash the same as ints, so keys skip int() here
+        size = self.cell_size
+        return (left // size, top // size, right // size, bottom // size)
+
+    def _file(self, obj, cell_range):
+        cells = self.cells
+        x0, y0, x1, y1 = map(int, cell_range)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = bucket = set()
+                bucket.add(obj)
+
+    def _unfile(self, obj, cell_range):
+        cells = self.cells
+        x0, y0, x1, y1 = map(int, cell_range)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(obj)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def insert(self, obj, left, top, right, bottom):
+        if obj in self._ranges:
+            self.move(obj, left, top, right, bottom)
+            return
+        cell_range = self._cell_range(left, top, right, bottom)
+        self._ranges[obj] = cell_range
+        self._file(obj, cell_range)
+
+    def move(self, obj, left, top, right, bottom):
+        """Update obj's box, touching the buckets only if its cells changed"""
+        size = self.cell_size
+        cell_range = (left // size, top // size, right // size, bottom // size)
+        old = self._ranges.get(obj)
+        if old == cell_range:
+            return
+        if old is not None:
+            self._unfile(obj, old)
+        self._ranges[obj] = cell_range
+        self._file(obj, cell_range)
+
+    def remove(self, obj):
+        old = self._ranges.pop(obj, None)
+        if old is not None:
+            self._unfile(obj, old)
+
+    def clear(self):
+        self.cells.clear()
+        self._ranges.clear()
+
+    def query(self, left, top, right, bottom):
+        """Objects filed in any cell the box touches (a superset of real overlaps).
+
+        The result may be the grid's own bucket; don't modify it.
+        """
+        cells = self.cells
+        size = self.cell_size
+        x0 = left // size
+        y0 = top // size
+        x1 = right // size
+        y1 = bottom // size
+        if x0 == x1 and y0 == y1:
+            return cells.get((x0, y0), ())
+        found = set()
+        for cx in range(int(x0), int(x1) + 1):
+            for cy in range(int(y0), int(y1) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
@@ -0,0 +1,223 @@
+"""Frame capture to disk without stalling the game loop.
+
+grab() copies the finished frame into the next free slot of a ring of
+preallocated buffers, one strided copy of the surface's pixels, and
+queues it. A writer thread empties the ring to disk. If the disk falls
+behind and no slot is free, the frame is dropped and counted rather
+than waited for, so the loop never blocks on I/O. Offline captures wait
+for a slot instead (drop=False), since there is no frame rate to keep.
+
+A capture is a directory holding either frames.raw, every frame's
+32-bit pixels back to back, or one lossless PNG per frame, plus
+capture.json describing them. Raw frames encode with e.g.
+
+    ffmpeg -f rawvideo -pix_fmt bgr0 -s 800x480 -r 60 -i frames.raw clip.mp4
+
+Offline, a replay can be rendered through the real renderer on SDL's
+dummy video driver as fast as the machine allows:
+
+    python -m quantum_pong.capture replays/20250101-120000.qpr [--format png]
+"""
+import argparse
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from .constants import CAPTURE_DIR, CAPTURE_SLOTS, FRAME_RATE
+
+FORMATS = ("raw", "png")
+
+# zlib level for PNG frames: fast, since the writer has to keep up
+PNG_COMPRESSION = 1
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_STOP = object()
+
+
+def pixel_format(surface):
+    """ffmpeg's name for the byte order of a 32-bit surface's pixels"""
+    shifts = surface.get_shifts()[:3]
+    if surface.get_bytesize() != 4 or sorted(shifts) != [0, 8, 16]:
+        raise ValueError("capture needs a 32-bit surface with RGB in the low three bytes")
+    # Little-endian: the channel at shift 0 is the first byte
+    order = sorted(zip(shifts, "rgb"))
+    return "".join(channel for _, channel in order) + "0"
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+class FrameCapture:
+    """Streams frames of one size to `directory` from a background thread"""
+
+    def __init__(self, directory, size, fps=FRAME_RATE, fmt="raw", slots=CAPTURE_SLOTS, drop=True):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown capture format {fmt!r}; choose from {', '.join(FORMATS)}")
+        self.directory = directory
+        self.width, self.height = size
+        self.fps = fps
+        self.format = fmt
+        self.drop = drop
+        self.pixel_format = None
+        self.frames = 0    # Grabbed and queued
+        self.written = 0   # On disk
+        self.dropped = 0   # Skipped for want of a free slot
+        self.stopped = False
+        os.makedirs(directory, exist_ok=True)
+
+        self._ring = np.empty((slots, self.height, self.width), dtype=np.uint32)
+        self._free = queue.SimpleQueue()
+        for slot in range(slots):
+            self._free.put(slot)
+        self._full = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="frame-capture", daemon=True)
+        self._thread.start()
+
+    def grab(self, surface):
+        """Queue a copy of surface's pixels; False if the frame was dropped"""
+        if self.stopped:
+            raise ValueError("capture is stopped")
+        if self.pixel_format is None:
+            self.pixel_format = pixel_format(surface)
+        try:
+            slot = self._free.get(block=not self.drop)
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        # The "2" view is (width, height); its transpose is the rows
+        pixels = surface.get_view("2")
+        np.copyto(self._ring[slot], np.asarray(pixels).T)
+        del pixels  # Unlocks the surface
+        self.frames += 1
+        self._full.put(slot)
+        return True
+
+    def _write_loop(self):
+        raw = None
+        if self.format == "raw":
+            raw = open(os.path.join(self.directory, "frames.raw"), "wb")
+        try:
+            while True:
+                slot = self._full.get()
+                if slot is _STOP:
+                    break
+                if raw is not None:
+                    raw.write(self._ring[slot])
+                else:
+                    self._write_png(self._ring[slot], self.written)
+                self.written += 1
+                self._free.put(slot)
+        finally:
+            if raw is not None:
+                raw.close()
+        info = {
+            "format": self.format, "width": self.width, "height": self.height, "fps": self.fps,
+            "pixel_format": self.pixel_format, "frames": self.written, "dropped": self.dropped,
+        }
+        with open(os.path.join(self.directory, "capture.json"), "w") as f:
+            json.dump(info, f, indent=2)
+
+    def _write_png(self, frame, index):
+        # Filter type 0 rows of RGB, compressed fast; zlib lets go of the
+        # GIL while it works, so the game loop keeps running
+        rgb = np.zeros((self.height, self.width * 3 + 1), dtype=np.uint8)
+        pixels = rgb[:, 1:].reshape(self.height, self.width, 3)
+        for i, channel in enumerate("rgb"):
+            pixels[..., i] = frame >> (8 * self.pixel_format.index(channel))
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        with open(os.path.join(self.directory, f"frame_{index:06d}.png"), "wb") as f:
+            f.write(PNG_SIGNATURE + _png_chunk(b"IHDR", header) +
+                    _png_chunk(b"IDAT", zlib.compress(rgb, PNG_COMPRESSION)) + _png_chunk(b"IEND", b""))
+
+    def stop(self):
+        """Take no more frames, without waiting.
+
+        The writer finishes the queued frames and saves capture.json on
+        its own.
+        """
+        if not self.stopped:
+            self.stopped = True
+            self._full.put(_STOP)
+
+    def close(self):
+        """stop() and wait until everything is on disk"""
+        self.stop()
+        self._thread.join()
+
+
+def render_replay(replay, directory, fmt="raw", fps=FRAME_RATE):
+    """Render a replay frame by frame into a capture; returns the FrameCapture"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    from .constants import WIDTH, HEIGHT, FONT_FAMILY, FONT_SIZE, SMALL_FONT_SIZE
+    from .fonts import load_font
+    from .render import Renderer
+    from .simulation import GameState
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), depth=32)
+    renderer = Renderer(screen, load_font(FONT_FAMILY, FONT_SIZE),
+                        load_font(FONT_FAMILY, SMALL_FONT_SIZE), seed=replay.seed)
+    game = GameState(seed=replay.seed, tick_rate=replay.tick_rate, branches=replay.branches,
+                     ai_level=replay.ai_level)
+    capture = FrameCapture(directory, (WIDTH, HEIGHT), fps, fmt, drop=False)
+
+    # Display frames fall between ticks just as they do in the game loop
+    tick_time = 1 / replay.tick_rate
+    frame_time = 1 / fps
+    accumulator = 0.0
+    inputs = replay.inputs()
+    ticks = 0
+    try:
+        while ticks < replay.ticks:
+            accumulator += frame_time
+            while accumulator >= tick_time and ticks < replay.ticks:
+                renderer.apply_events(game.step(next(inputs)))
+                ticks += 1
+                accumulator -= tick_time
+            renderer.draw(game, accumulator / tick_time, frame_time * 60)
+            capture.grab(screen)
+    finally:
+        capture.close()
+        pygame.quit()
+    return capture
+
+
+def main(argv=None):
+    from .replay import Replay
+
+    parser = argparse.ArgumentParser(prog="python -m quantum_pong.capture",
+                                     description="Render a replay to raw or PNG frames, headless.")
+    parser.add_argument("replay", help=".qpr replay file")
+    parser.add_argument("--out", help=f"capture directory (default: {CAPTURE_DIR}/<replay name>)")
+    parser.add_argument("--format", choices=FORMATS, default="raw")
+    parser.add_argument("--fps", type=int, default=FRAME_RATE, help="frames per second of play")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.replay)
+    out = args.out or os.path.join(CAPTURE_DIR, os.path.splitext(os.path.basename(args.replay))[0])
+    start = time.perf_counter()
+    capture = render_replay(replay, out, args.format, args.fps)
+    elapsed = time.perf_counter() - start
+    played = replay.ticks / replay.tick_rate
+    print(f"{capture.written} frames written to {out} in {elapsed:.1f}s "
+          f"({played / max(elapsed, 1e-9):.1f}x real time)")
+    if capture.format == "raw":
+        print(f"encode with: ffmpeg -f rawvideo -pix_fmt {capture.pixel_format} "
+              f"-s {capture.width}x{capture.height} -r {capture.fps} "
+              f"-i {os.path.join(out, 'frames.raw')} clip.mp4")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""One pass over every circular effect of a frame: particles and trail dots.
+
+The renderer queues every dot as a splat (center, radius, color, alpha)
+and composite() draws the whole queue with one Surface.blits call of
+cached circle sprites, in queue order. SDL blends each sprite over what
+is already there, so overlapping dots build up their glow exactly as
+separate blits did, on a surface of any depth.
+
+Batches of COMPOSITE_MIN_SPLATS or more, i.e. the particle pools, are
+grouped with NumPy so the sprites are looked up once per distinct
+(radius, color, alpha); short ones such as a trail are cheaper looked up
+one by one.
+"""
+import math
+
+import numpy as np
+import pygame
+
+from .sprites import ALPHA_STEP
+
+# Radii snap to half pixels, like SpriteCache.circle; larger ones are clipped
+MAX_SPLAT_RADIUS = 16
+
+# Splats in one add() from which grouping them before the sprite lookups pays
+COMPOSITE_MIN_SPLATS = 100
+
+
+class EffectCompositor:
+    def __init__(self, sprites):
+        self.sprites = sprites
+        self._queue = []
+
+    def add(self, xs, ys, radii, colors, alphas, merge=True):
+        """Queue splats for the next composite().
+
+        xs, ys are centers and radii are in pixels; colors is one RGB or a
+        row per splat; alphas are 0-255, one per splat. Any of them may be
+        lists or arrays. Returns the dirty rects they will cover: one
+        bounding rect, or one per splat if merge is False.
+        """
+        count = len(xs)
+        if not count:
+            return []
+        single = np.ndim(colors) == 1
+        if count < COMPOSITE_MIN_SPLATS:
+            lefts, tops, sides = self._add_each(xs, ys, radii, colors, alphas, single)
+        else:
+            lefts, tops, sides = self._add_grouped(xs, ys, radii, colors, alphas, single)
+        if merge:
+            x0, y0 = min(lefts), min(tops)
+            x1 = max(left + side for left, side in zip(lefts, sides))
+            y1 = max(top + side for top, side in zip(tops, sides))
+            return [pygame.Rect(x0, y0, x1 - x0, y1 - y0)]
+        return [pygame.Rect(x, y, s, s) for x, y, s in zip(lefts, tops, sides)]
+
+    def _add_each(self, xs, ys, radii, colors, alphas, single):
+        circle = self.sprites.circle
+        floor = math.floor
+        if single:
+            colors = [tuple(colors)] * len(xs)
+        elif not isinstance(colors, list):
+            colors = colors.tolist()
+        lefts, tops, sides = [], [], []
+        queue = self._queue
+        for x, y, radius, alpha, color in zip(*(v if isinstance(v, list) else v.tolist()
+                                                for v in (xs, ys, radii, alphas)), colors):
+            # round() halves to even like np.rint, so both paths snap alike
+            key = round(min(radius, MAX_SPLAT_RADIUS) * 2)
+            left = floor(x - key / 2)
+            top = floor(y - key / 2)
+            queue.append((circle(key / 2, color, alpha), (left, top)))
+            lefts.append(left)
+            tops.append(top)
+            sides.append(key or 1)
+        return lefts, tops, sides
+
+    def _add_grouped(self, xs, ys, radii, colors, alphas, single):
+        keys = np.rint(np.minimum(radii, MAX_SPLAT_RADIUS) * 2).astype(np.intp)
+        half = keys * 0.5
+        left = np.floor(np.asarray(xs) - half).astype(np.intp)
+        top = np.floor(np.asarray(ys) - half).astype(np.intp)
+        # Quantize alphas as SpriteCache does, then pack each splat's look
+        # into one integer so np.unique can group them
+        alphas = np.asarray(alphas).astype(np.intp)
+        alphas = np.where(alphas >= 255, 255,
+                          np.clip((alphas + ALPHA_STEP // 2) // ALPHA_STEP * ALPHA_STEP, 0, 255))
+        colors = np.asarray(colors, dtype=np.intp)
+        if single:
+            colors = colors[np.newaxis]
+        rgb = (colors[:, 0] << 16) | (colors[:, 1] << 8) | colors[:, 2]
+        looks, which = np.unique((keys << 32) | (rgb << 8) | alphas, return_inverse=True)
+        circle = self.sprites.circle
+        sprites = np.empty(len(looks), dtype=object)
+        sprites[:] = [circle((look >> 32) / 2, ((look >> 24) & 0xFF, (look >> 16) & 0xFF, (look >> 8) & 0xFF),
+                             look & 0xFF) for look in looks.tolist()]
+        lefts, tops = left.tolist(), top.tolist()
+        self._queue.extend(zip(sprites[which].tolist(), zip(lefts, tops)))
+        return lefts, tops, np.maximum(keys, 1).tolist()
+
+    def composite(self, surface):
+        """Blit every queued splat onto surface, in queue order, and empty the queue"""
+        queue = self._queue
+        self._queue = []
+        if queue:
+            surface.blits(queue, doreturn=False)
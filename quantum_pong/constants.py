@@ -0,0 +1,99 @@
+# Screen
+WIDTH, HEIGHT = 800, 480
+
+# UI font family and sizes
+FONT_FAMILY = "Arial"
+FONT_SIZE, SMALL_FONT_SIZE = 24, 16
+
+# Colors
+WHITE, BLACK = (255, 255, 255), (0, 0, 0)
+BLUE, CYAN = (0, 102, 255), (0, 255, 255)
+RED, YELLOW, GREEN = (255, 0, 0), (255, 255, 0), (0, 255, 0)
+PURPLE, ORANGE = (128, 0, 128), (255, 165, 0)
+DARK_BLUE = (0, 20, 40)
+NEON_CYAN = (0, 255, 255)
+NEON_PINK = (255, 20, 147)
+
+# Constants
+BALL_RADIUS, PADDLE_WIDTH, PADDLE_HEIGHT = 10, 10, 80
+BASE_SPEED = 7
+MAX_SPEED = 12
+JERK_SPEED = 16
+JERK_DURATION = 20
+SPEED_INCREMENT = 0.5
+DELAY_FRAMES = 60
+Z_NOISE_INTERVAL = 240
+Z_NOISE_CHANCE = 0.3
+GATE_DROP_INTERVAL = 240
+MEASUREMENT_TIMEOUT = 360
+GATE_TYPES = ['X', 'Z', 'H']
+
+# Branches a gate splits the ball into: a power of two up to MAX_BRANCHES
+BRANCHES = 2
+MAX_BRANCHES = 16
+
+# Movement per frame
+PLAYER_SPEED = 6
+OPPONENT_SPEED = 4
+POWERUP_FALL_SPEED = 3
+POWERUP_SIZE = 48
+
+# Opponent AI difficulty, one of ai.AI_LEVELS or "classic" for the
+# original ball-following AI
+AI_LEVEL = "normal"
+
+# Input bits for one frame
+INPUT_UP = 1
+INPUT_DOWN = 2
+INPUT_X = 4
+INPUT_Z = 8
+INPUT_H = 16
+
+# Durations and speeds above are per 60 FPS frame; the simulation scales
+# them to its own tick rate, which is independent of the display rate
+TICK_RATE = 120
+FRAME_RATE = 60
+MAX_FRAME_TIME = 0.25  # Longest frame the physics will catch up on
+
+# Gate keys fire on key-down; holding one repeats only if the delay is
+# positive (ms), and no gate fires twice within the cooldown (ms)
+GATE_REPEAT_DELAY = 0
+GATE_REPEAT_INTERVAL = 250
+GATE_COOLDOWN = 150
+
+# Gameplay events kept in memory by the event log
+EVENT_LOG_SIZE = 1024
+
+# Every session's inputs are saved here on exit for replaying
+REPLAY_DIR = "replays"
+
+# F9 frame capture: directory, and frames buffered for the writer thread
+# (1.5 MB each at 800x480); frames with no free buffer are dropped
+CAPTURE_DIR = "captures"
+CAPTURE_SLOTS = 30
+
+# Frame profiler: frames kept for percentiles and CSV export, overlay refresh
+PROFILE_FRAMES = 3600
+PROFILE_DIR = "profiles"
+PROFILE_REFRESH_FRAMES = 30
+
+# Networked versus mode: default UDP port, and how often the host sends
+# snapshots and the client sends its inputs (per second)
+NET_PORT = 47320
+SNAPSHOT_RATE = 30
+INPUT_RATE = 60
+
+# Localhost port of the Prometheus metrics endpoint; None turns it off
+METRICS_PORT = 9464
+
+# Gameplay states kept for rollback and rewinding, in ticks
+ROLLBACK_TICKS = 240
+
+# Power-up messages stay up for 2 seconds, the score pause for 1 second
+MESSAGE_FRAMES = 120
+SCORE_PAUSE_FRAMES = 60
+
+# Particle effects
+MAX_PARTICLES = 4096  # Pool capacity, was a hard cap of 100 list entries
+BACKGROUND_PARTICLES = 20  # Reduced from 50 to 20
+PARTICLE_DAMPING = 0.98
@@ -0,0 +1,55 @@
+from .constants import GATE_REPEAT_DELAY, GATE_REPEAT_INTERVAL, GATE_COOLDOWN
+
+
+class GateKeys:
+    """Edge-triggered gate keys with optional auto-repeat and a cooldown.
+
+    A gate fires once when its key goes down instead of on every frame it is
+    held. If repeat_delay is positive, a held key fires again after that many
+    milliseconds and then every repeat_interval. No gate fires twice within
+    `cooldown` ms, however fast the key is tapped. bindings maps key codes
+    to INPUT_* bits; times are in milliseconds, e.g. pygame.time.get_ticks().
+    """
+
+    def __init__(self, bindings, repeat_delay=GATE_REPEAT_DELAY,
+                 repeat_interval=GATE_REPEAT_INTERVAL, cooldown=GATE_COOLDOWN):
+        self.bindings = bindings
+        self.repeat_delay = repeat_delay
+        self.repeat_interval = repeat_interval
+        self.cooldown = cooldown
+        self._next_repeat = {}
+        self._last_fired = {}
+        self._pending = 0
+
+    def _fire(self, bit, now):
+        last = self._last_fired.get(bit)
+        if last is not None and now - last < self.cooldown:
+            return
+        self._last_fired[bit] = now
+        self._pending |= bit
+
+    def key_down(self, key, now):
+        bit = self.bindings.get(key)
+        if bit is None:
+            return
+        self._fire(bit, now)
+        if self.repeat_delay > 0:
+            self._next_repeat[key] = now + self.repeat_delay
+
+    def key_up(self, key):
+        self._next_repeat.pop(key, None)
+
+    def release_all(self):
+        """Forget held keys, e.g. when the window loses focus"""
+        self._next_repeat.clear()
+
+    def poll(self, now):
+        """Gate bits fired since the last poll"""
+        if self._next_repeat:
+            for key, due in self._next_repeat.items():
+                if now >= due:
+                    self._fire(self.bindings[key], now)
+                    self._next_repeat[key] = now + self.repeat_interval
+        fired = self._pending
+        self._pending = 0
+        return fired
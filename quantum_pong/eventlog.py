@@ -0,0 +1,76 @@
+import json
+import queue
+import threading
+from collections import deque
+
+from .constants import EVENT_LOG_SIZE
+
+# Field names of the gameplay events worth logging; cosmetic ones are skipped
+EVENT_FIELDS = {
+    "gate": ("gate", "source", "detail"),
+    "collapse": ("outcome", "cause"),
+    "paddle_hit": ("ball",),
+    "z_noise": (),
+    "score": ("scorer",),
+}
+
+_STOP = object()
+
+
+class EventLog:
+    """In-memory log of gameplay events with an optional background sink.
+
+    record() turns GameState events into dicts, keeps the latest `capacity`
+    of them in `entries` and hands them to a writer thread, which writes
+    them to `stream` as JSON lines in batches. The game loop never waits
+    on the stream.
+    """
+
+    def __init__(self, stream=None, capacity=EVENT_LOG_SIZE):
+        self.entries = deque(maxlen=capacity)
+        self.stream = stream
+        self._queue = None
+        self._thread = None
+        if stream is not None:
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._write_loop, name="event-log", daemon=True)
+            self._thread.start()
+
+    def record(self, frame, events):
+        """Log the gameplay events among one step()'s events"""
+        for event in events:
+            fields = EVENT_FIELDS.get(event[0])
+            if fields is None:
+                continue
+            entry = {"frame": frame, "event": event[0]}
+            entry.update(zip(fields, event[1:]))
+            self.log(entry)
+
+    def log(self, entry):
+        """Add one already-built entry, e.g. a startup report"""
+        self.entries.append(entry)
+        if self._queue is not None:
+            self._queue.put(entry)
+
+    def _write_loop(self):
+        get = self._queue.get
+        while True:
+            batch = [get()]
+            # Drain whatever else is queued so a burst costs one write
+            while not self._queue.empty():
+                batch.append(get())
+            stop = any(entry is _STOP for entry in batch)
+            if stop:
+                batch = [entry for entry in batch if entry is not _STOP]
+            if batch:
+                self.stream.write("".join(json.dumps(entry) + "\n" for entry in batch))
+                self.stream.flush()
+            if stop:
+                return
+
+    def close(self):
+        """Write out everything still queued and stop the writer thread"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
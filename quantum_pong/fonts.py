@@ -0,0 +1,53 @@
+import json
+import os
+
+import pygame
+
+# Where resolved font paths persist between runs; SysFont() rescans every time
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                         "quantum_pong")
+FONT_CACHE_PATH = os.path.join(CACHE_DIR, "fonts.json")
+
+_resolved = {}
+
+
+def _read_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(path, cache):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # Read-only home: we just resolve again next run
+
+
+def font_path(family, cache_path=FONT_CACHE_PATH):
+    """File for a system font family, or None for pygame's bundled font.
+
+    Looked up once per process, and across runs through a small JSON cache.
+    A cached path that no longer exists is resolved again; delete the cache
+    file to pick up newly installed fonts.
+    """
+    if family in _resolved:
+        return _resolved[family]
+    cache = _read_cache(cache_path)
+    if family in cache and (cache[family] is None or os.path.exists(cache[family])):
+        path = cache[family]
+    else:
+        path = pygame.font.match_font(family)
+        cache[family] = path
+        _write_cache(cache_path, cache)
+    _resolved[family] = path
+    return path
+
+
+def load_font(family, size):
+    """pygame.font.SysFont(family, size) without the per-call system font scan"""
+    return pygame.font.Font(font_path(family), size)
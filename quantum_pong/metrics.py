@@ -0,0 +1,175 @@
+"""Live gameplay metrics in the Prometheus text format.
+
+The game loop updates plain counters and fixed-bucket histograms, an
+increment or two per event and per frame. A ThreadingHTTPServer on a
+background thread renders them when scraped, so a fleet of cabinets can
+be watched for slow frames or odd gameplay without a profiler:
+
+    curl http://127.0.0.1:9464/metrics
+
+Only the game loop writes and only the server reads, so no locks are
+taken; a scrape may see a histogram's count one frame ahead of its sum.
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .constants import METRICS_PORT, TICK_RATE, GATE_TYPES
+
+PREFIX = "quantum_pong_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram bucket upper bounds, in seconds
+FRAME_BUCKETS = (0.001, 0.002, 0.004, 0.008, 0.0167, 0.025, 0.033, 0.05, 0.1, 0.25)
+RALLY_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 120, 300)
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    """A counter per combination of label values"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=(), known=()):
+        self.name = PREFIX + name + "_total"
+        self.help = help_text
+        self.labels = labels
+        # Label combinations listed up front show as 0 before they happen
+        self.values = dict.fromkeys(known, 0) if labels else {(): 0}
+
+    def inc(self, *values):
+        self.values[values] = self.values.get(values, 0) + 1
+
+    def render(self):
+        return [f"{self.name}{_labels(self.labels, key)} {value}"
+                for key, value in list(self.values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def __init__(self, name, help_text):
+        super().__init__(name, help_text)
+        self.name = PREFIX + name
+
+    def set(self, value):
+        self.values[()] = value
+
+
+class Histogram:
+    """Counts per bucket, made cumulative only when rendered"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def render(self):
+        counts = list(self.counts)
+        lines = []
+        total = 0
+        for bound, count in zip(self.buckets + ("+Inf",), counts):
+            total += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {total}')
+        lines.append(f"{self.name}_sum {self.sum}")
+        lines.append(f"{self.name}_count {total}")
+        return lines
+
+
+class GameMetrics:
+    """The game's metrics, fed with each step()'s events and each frame's time"""
+
+    def __init__(self, tick_rate=TICK_RATE):
+        self.tick_rate = tick_rate
+        self.frame_seconds = Histogram("frame_seconds", "Work time per frame, excluding the wait "
+                                       "for the next frame", FRAME_BUCKETS)
+        self.quality_tier = Gauge("quality_tier", "Current effect quality tier, 0 is lowest")
+        self.collapses = Counter("collapses", "Ball measurements by cause", ("cause",),
+                                 [("paddle",), ("timeout",)])
+        self.gates = Counter("gates", "Gates applied by gate and source", ("gate", "source"),
+                             [(gate, source) for gate in GATE_TYPES for source in ("manual", "powerup")])
+        self.z_noise = Counter("z_noise_flips", "Z-noise direction flips")
+        self.paddle_hits = Counter("paddle_hits", "Ball contacts with a paddle")
+        self.scores = Counter("scores", "Points by scorer", ("scorer",), [("player",), ("opponent",)])
+        self.rally_seconds = Histogram("rally_seconds", "Seconds from serve to point", RALLY_BUCKETS)
+        self.all = (self.frame_seconds, self.quality_tier, self.collapses, self.gates, self.z_noise,
+                    self.paddle_hits, self.scores, self.rally_seconds)
+        self._rally_ticks = 0
+
+    def record(self, events, playing=True):
+        """Count the gameplay events of one step().
+
+        `playing` is False during the pause after a point, which isn't
+        part of any rally.
+        """
+        self._rally_ticks += playing
+        for event in events:
+            kind = event[0]
+            if kind == "explosion" or kind == "clear_trail":
+                continue
+            if kind == "collapse":
+                self.collapses.inc(event[2])
+            elif kind == "gate":
+                self.gates.inc(event[1], event[2])
+            elif kind == "z_noise":
+                self.z_noise.inc()
+            elif kind == "paddle_hit":
+                self.paddle_hits.inc()
+            elif kind == "score":
+                self.scores.inc(event[1])
+                self.rally_seconds.observe(self._rally_ticks / self.tick_rate)
+                self._rally_ticks = 0
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.all:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves a GameMetrics at http://address:port/metrics from a daemon thread"""
+
+    def __init__(self, metrics, port=METRICS_PORT, address="127.0.0.1"):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood stderr
+
+        self.metrics = metrics
+        self._server = ThreadingHTTPServer((address, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
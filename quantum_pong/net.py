@@ -0,0 +1,812 @@
+"""Networked versus mode: two cabinets over UDP.
+
+The host runs the only authoritative GameState. The joining client sends
+its input bits for every tick, and the host plays them as the right-hand
+paddle. SNAPSHOT_RATE times a second the host sends back what the client
+needs to draw: paddles, ball branches, ball state, power-ups, scores,
+messages, and the effects, gates and points since the last snapshot.
+Each snapshot is delta compressed against the last one the client
+acknowledged, so a field that hasn't changed costs nothing.
+
+The client hides the latency. Its own paddle is predicted: inputs move it
+at once, and each snapshot's paddle is replayed forward through the
+inputs the host hasn't played yet. The ball is extrapolated from each
+snapshot by half the round trip, then moved every tick with the host's
+physics until the next snapshot corrects it.
+
+No packet is ever resent. Inputs repeat until acknowledged and snapshots
+are complete against their base, so a lost packet is covered by the next
+one. LinkShim delays and drops outgoing packets, to try this on one
+machine:
+
+    python -m quantum_pong.net host [--port N]
+    python -m quantum_pong.net join HOST[:PORT]
+    python -m quantum_pong.net loopback --latency 100 --loss 0.05
+"""
+import argparse
+import asyncio
+import queue
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from .ai import track_ball
+from .constants import NET_PORT, SNAPSHOT_RATE, INPUT_RATE
+from .physics import move_ball
+from .simulation import (
+    GameState, FallingGate, PLAYING, SCORED, INPUT_UP, INPUT_DOWN, INPUT_H,
+)
+
+MAGIC = b"QN"
+VERSION = 1
+
+# Packet kinds
+HELLO, WELCOME, INPUTS, SNAPSHOT = range(4)
+
+# Every packet starts with magic and kind
+PACKET = struct.Struct("<2sB")
+# HELLO: protocol version
+HELLO_BODY = struct.Struct("<B")
+# WELCOME: protocol version, tick rate, ball branches
+WELCOME_BODY = struct.Struct("<BHB")
+# INPUTS: client clock (ms), newest snapshot tick received, seq of the first
+# input; then (input, run length) byte pairs, as in replay files
+INPUTS_BODY = struct.Struct("<III")
+# SNAPSHOT: tick, base tick (0 for none), last input seq played, echoed
+# client clock, ms the host held that clock, mask of the fields sent; then
+# each field sent as a length and its bytes
+SNAPSHOT_BODY = struct.Struct("<IIIIHH")
+FIELD_LENGTH = struct.Struct("<H")
+
+# Snapshot fields, in mask bit order. "events" is never a delta: it holds
+# the effects, gates and points since the previous snapshot and is sent
+# whenever it isn't empty
+FIELDS = ("paddles", "score", "round", "label", "balls", "powerups", "messages", "events")
+
+SCORE = struct.Struct("<HH")
+ROUND = struct.Struct("<BB")  # scored, measured branch
+BALL_MASK = struct.Struct("<H")
+POWERUP = struct.Struct("<HBhh")  # serial, gate, x, y
+MESSAGE_TIME = struct.Struct("<f")
+EXPLOSION = struct.Struct("<hhBBBB")  # x, y, color, particle count
+
+# Event kinds in the "events" field
+EXPLOSION_EVENT, CLEAR_TRAIL_EVENT, COLLAPSE_EVENT, GATE_EVENT, SCORE_EVENT = range(5)
+COLLAPSE_CAUSES = ("paddle", "timeout")
+GATE_SOURCES = ("manual", "powerup")
+SCORERS = ("player", "opponent")
+
+# Round byte for a ball in superposition
+NO_BRANCH = 255
+
+# Fixed point: positions in quarter pixels, velocities in 1/256 px per frame
+POSITION_SCALE = 4
+VELOCITY_SCALE = 256
+BALL_SCALES = np.array([POSITION_SCALE, POSITION_SCALE, VELOCITY_SCALE, VELOCITY_SCALE])
+
+MOVEMENT = INPUT_UP | INPUT_DOWN
+
+# IPv4 and UDP headers, counted in the bandwidth figures
+UDP_OVERHEAD = 28
+
+# Inputs the host lets pile up before it plays two per tick to catch up
+JITTER_TICKS = 4
+# Unacknowledged inputs the client keeps resending; older ones are given up
+MAX_UNACKED = 255
+MAX_RUN = 255
+# Snapshots each side keeps as delta bases
+HISTORY = 64
+# Furthest the client extrapolates the ball past a snapshot
+MAX_LEAD_TICKS = 30
+# Effects per snapshot; any more are dropped
+MAX_EVENTS = 64
+# Weight of each new round-trip sample in the running estimate
+RTT_SMOOTHING = 0.1
+# Seconds between HELLOs while joining
+HELLO_INTERVAL = 0.25
+
+
+def _now_ms():
+    return int(time.perf_counter() * 1000) & 0xFFFFFFFF
+
+
+def _pack(kind, body):
+    return PACKET.pack(MAGIC, kind) + body
+
+
+def _unpack(data):
+    # (kind, body) of a packet; ValueError for anything that isn't one of ours
+    if len(data) < PACKET.size:
+        raise ValueError("short packet")
+    magic, kind = PACKET.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a Quantum Pong packet")
+    return kind, data[PACKET.size:]
+
+
+def _fixed(values, scale):
+    return np.clip(np.rint(np.asarray(values) * scale), -32768, 32767).astype("<i2")
+
+
+def _text(text):
+    data = text.encode()[:255]
+    return bytes((len(data),)) + data
+
+
+def _read_text(data, offset=0):
+    end = offset + 1 + data[offset]
+    return data[offset + 1:end].decode(errors="replace"), end
+
+
+def encode_state(game):
+    """The snapshot fields of a GameState, each as bytes (all but "events")"""
+    balls = game.balls
+    visible = balls.on_screen()
+    columns = np.stack((balls.x[visible], balls.y[visible], balls.dx[visible], balls.dy[visible]), axis=1)
+    powerups = game.powerups
+    return {
+        "paddles": _fixed((game.player.y, game.opponent.y), POSITION_SCALE).tobytes(),
+        "score": SCORE.pack(game.player_score, game.opponent_score),
+        "round": ROUND.pack(game.phase == SCORED, NO_BRANCH if game.branch is None else game.branch),
+        "label": _text(game.state_label),
+        "balls": BALL_MASK.pack(sum(1 << i for i in visible)) + _fixed(columns, BALL_SCALES).tobytes(),
+        "powerups": bytes((len(powerups),)) + b"".join(
+            POWERUP.pack(pu.serial & 0xFFFF, ord(pu.gate), *_fixed((pu.rect.x, pu.rect.y), POSITION_SCALE).tolist())
+            for pu in powerups),
+        "messages": (_text(game.collapse_message) + _text(game.powerup_message) +
+                     MESSAGE_TIME.pack(game.powerup_msg_time)),
+    }
+
+
+def encode_events(events):
+    """The explosions, trail resets, collapses, gates and points among some GameState events"""
+    data = bytearray()
+    count = 0
+    for event in events:
+        kind = event[0]
+        if kind == "explosion":
+            _, x, y, color, particles = event
+            data.append(EXPLOSION_EVENT)
+            data += EXPLOSION.pack(int(x), int(y), *color, min(particles, 255))
+        elif kind == "clear_trail":
+            data += bytes((CLEAR_TRAIL_EVENT, event[1]))
+        elif kind == "collapse":
+            data += bytes((COLLAPSE_EVENT, COLLAPSE_CAUSES.index(event[2]))) + _text(event[1])
+        elif kind == "gate":
+            _, gate, source, detail = event
+            data += bytes((GATE_EVENT, ord(gate), GATE_SOURCES.index(source))) + _text(detail)
+        elif kind == "score":
+            data += bytes((SCORE_EVENT, SCORERS.index(event[1])))
+        else:
+            continue
+        count += 1
+        if count == MAX_EVENTS:
+            break
+    return bytes(data)
+
+
+def decode_events(data):
+    events = []
+    offset = 0
+    while offset < len(data):
+        kind = data[offset]
+        offset += 1
+        if kind == EXPLOSION_EVENT:
+            x, y, r, g, b, particles = EXPLOSION.unpack_from(data, offset)
+            offset += EXPLOSION.size
+            events.append(("explosion", x, y, (r, g, b), particles))
+        elif kind == CLEAR_TRAIL_EVENT:
+            events.append(("clear_trail", data[offset]))
+            offset += 1
+        elif kind == COLLAPSE_EVENT:
+            cause = COLLAPSE_CAUSES[data[offset]]
+            outcome, offset = _read_text(data, offset + 1)
+            events.append(("collapse", outcome, cause))
+        elif kind == GATE_EVENT:
+            gate, source = chr(data[offset]), GATE_SOURCES[data[offset + 1]]
+            detail, offset = _read_text(data, offset + 2)
+            events.append(("gate", gate, source, detail))
+        elif kind == SCORE_EVENT:
+            events.append(("score", SCORERS[data[offset]]))
+            offset += 1
+        else:
+            raise ValueError(f"unknown event kind {kind}")
+    return events
+
+
+class LinkShim:
+    """Stands in for a datagram transport, delaying and dropping what is sent.
+
+    Every packet is held for `latency` seconds plus up to `jitter` more, so
+    packets can also arrive out of order, and a `loss` fraction of them
+    never leave. Put one on each end to simulate a link on loopback.
+    """
+
+    def __init__(self, transport, loop, latency=0.0, jitter=0.0, loss=0.0, seed=None):
+        self.transport = transport
+        self.loop = loop
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.dropped = 0
+
+    def sendto(self, data, addr=None):
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency + self.rng.uniform(0, self.jitter)
+        if delay > 0:
+            self.loop.call_later(delay, self._send, data, addr)
+        else:
+            self.transport.sendto(data, addr)
+
+    def _send(self, data, addr):
+        if not self.transport.is_closing():
+            self.transport.sendto(data, addr)
+
+
+class _Protocol(asyncio.DatagramProtocol):
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+
+    def datagram_received(self, data, addr):
+        endpoint = self.endpoint
+        endpoint.packets_received += 1
+        endpoint.bytes_received += len(data) + UDP_OVERHEAD
+        endpoint.received.put((data, addr))
+
+    def error_received(self, exc):
+        # E.g. port unreachable while the other side isn't up yet; with
+        # UDP the next packet simply tries again
+        pass
+
+
+class Endpoint:
+    """A UDP socket served by an asyncio loop on a background thread.
+
+    Received datagrams queue up for the game thread to drain, and send()
+    hands packets to the loop without waiting, so the game loop never
+    blocks on the network. latency, jitter and loss put a LinkShim on
+    everything sent.
+    """
+
+    def __init__(self, local_addr, latency=0.0, jitter=0.0, loss=0.0, seed=None):
+        self.received = queue.SimpleQueue()
+        self.peer = None
+        self.packets_sent = self.packets_received = 0
+        self.bytes_sent = self.bytes_received = 0
+        self.shim = None
+        self._link = (latency, jitter, loss, seed)
+        self._loop = asyncio.new_event_loop()
+        self._error = None
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(local_addr, ready), name="net", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+
+    def _run(self, local_addr, ready):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            transport, _ = loop.run_until_complete(
+                loop.create_datagram_endpoint(lambda: _Protocol(self), local_addr=local_addr))
+        except OSError as error:
+            self._error = error
+            loop.close()
+            ready.set()
+            return
+        self.address = transport.get_extra_info("sockname")
+        self._transport = transport
+        latency, jitter, loss, seed = self._link
+        if latency or jitter or loss:
+            self._transport = self.shim = LinkShim(transport, loop, latency, jitter, loss, seed)
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            transport.close()
+            loop.run_until_complete(asyncio.sleep(0))
+            loop.close()
+
+    def send(self, data):
+        self.packets_sent += 1
+        self.bytes_sent += len(data) + UDP_OVERHEAD
+        self._loop.call_soon_threadsafe(self._transport.sendto, data, self.peer)
+
+    def packets(self):
+        """Drain the received packets as (kind, body, address), skipping foreign ones"""
+        received = self.received
+        while not received.empty():
+            data, addr = received.get()
+            try:
+                kind, body = _unpack(data)
+            except (ValueError, struct.error):
+                continue
+            yield kind, body, addr
+
+    def close(self):
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+
+class Host(Endpoint):
+    """The authoritative side: steps `game`, with the client as its opponent.
+
+    Call tick(inputs) once per simulation tick in place of game.step(). The
+    game waits, unstepped, until a client joins.
+    """
+
+    def __init__(self, game, port=NET_PORT, address="0.0.0.0", **link):
+        super().__init__((address, port), **link)
+        self.game = game
+        self.snapshot_interval = max(1, round(game.tick_rate / SNAPSHOT_RATE))
+        game.collapse_message = f"Waiting for a player on port {self.address[1]}"
+
+        # Client inputs by seq, not yet played; the next one to play
+        self._inputs = {}
+        self.next_seq = 1
+        self._newest_seq = 0
+        self._last_input = 0
+        # Newest client clock reading and when it arrived, echoed for round trips
+        self._clock = None
+
+        # Snapshots sent, by tick, and the newest one the client has
+        self._sent = {}
+        self._acked_tick = 0
+        self._events = []
+
+    def _receive(self):
+        for kind, body, addr in self.packets():
+            try:
+                if kind == HELLO:
+                    self._hello(body, addr)
+                elif kind == INPUTS and addr == self.peer:
+                    self._read_inputs(body)
+            except (ValueError, struct.error):
+                continue
+
+    def _hello(self, body, addr):
+        version, = HELLO_BODY.unpack_from(body)
+        if version != VERSION or (self.peer is not None and addr != self.peer):
+            return
+        if self.peer is None:
+            self.peer = addr
+            self.game.collapse_message = ""
+        # Answer every HELLO, in case a WELCOME was lost
+        game = self.game
+        self.send(_pack(WELCOME, WELCOME_BODY.pack(VERSION, game.tick_rate, game.branches)))
+
+    def _read_inputs(self, body):
+        sent_ms, acked_tick, first = INPUTS_BODY.unpack_from(body)
+        runs = body[INPUTS_BODY.size:]
+        self._acked_tick = max(self._acked_tick, acked_tick)
+        if first > self.next_seq:
+            # The client gave up on inputs this old; skip ahead
+            self.next_seq = first
+            self._inputs = {seq: bits for seq, bits in self._inputs.items() if seq >= first}
+        seq = first
+        inputs = self._inputs
+        for bits, count in zip(runs[::2], runs[1::2]):
+            for _ in range(count):
+                if seq >= self.next_seq:
+                    inputs[seq] = bits
+                seq += 1
+        if seq - 1 > self._newest_seq:
+            self._newest_seq = seq - 1
+            self._clock = (sent_ms, time.perf_counter())
+
+    def remote_input(self):
+        """The client's input for this tick.
+
+        Inputs play in order, each once. When the next one hasn't arrived,
+        the paddle keeps moving as before but no gate fires; when jitter
+        piles them up, two play per tick until the backlog is small again.
+        """
+        inputs = self._inputs
+        bits = inputs.pop(self.next_seq, None)
+        if bits is None:
+            return self._last_input & MOVEMENT
+        self.next_seq += 1
+        while len(inputs) > JITTER_TICKS and self.next_seq in inputs:
+            bits = (bits & ~MOVEMENT) | inputs.pop(self.next_seq)
+            self.next_seq += 1
+        self._last_input = bits
+        return bits
+
+    def tick(self, inputs):
+        """Step the game with the local and remote inputs; returns its events"""
+        self._receive()
+        if self.peer is None:
+            return []
+        game = self.game
+        events = game.step(inputs, self.remote_input())
+        self._events.extend(events)
+        if game.frame % self.snapshot_interval == 0:
+            self.send_snapshot()
+        return events
+
+    def send_snapshot(self):
+        game = self.game
+        tick = game.frame
+        fields = encode_state(game)
+        base = self._sent.get(self._acked_tick)
+        fields["events"] = encode_events(self._events)
+        self._events.clear()
+
+        mask = 0
+        parts = []
+        for bit, name in enumerate(FIELDS):
+            data = fields[name]
+            if name == "events" and not data:
+                continue
+            if base is None or name == "events" or base[name] != data:
+                mask |= 1 << bit
+                parts += (FIELD_LENGTH.pack(len(data)), data)
+        del fields["events"]
+
+        client_ms, hold_ms = 0, 0
+        if self._clock is not None:
+            client_ms, received = self._clock
+            hold_ms = min(int((time.perf_counter() - received) * 1000), 0xFFFF)
+        header = SNAPSHOT_BODY.pack(tick, self._acked_tick if base is not None else 0,
+                                    self.next_seq - 1, client_ms, hold_ms, mask)
+        self.send(_pack(SNAPSHOT, header + b"".join(parts)))
+
+        self._sent[tick] = fields
+        if len(self._sent) > HISTORY:
+            del self._sent[next(iter(self._sent))]
+
+
+class Client(Endpoint):
+    """The joining side: plays the right-hand paddle of the host's game.
+
+    self.game mirrors the host's GameState once connected. It is never
+    stepped; tick(inputs) moves it instead, from snapshots plus prediction,
+    and returns the host's effects for the renderer.
+    """
+
+    def __init__(self, host, port=NET_PORT, **link):
+        super().__init__(("0.0.0.0", 0), **link)
+        self.peer = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_DGRAM)[0][4]
+        self.game = None
+        self._next_hello = 0.0
+
+        # Inputs the host hasn't played yet, as (seq, bits)
+        self.seq = 0
+        self._pending = deque()
+
+        # Snapshots received, by tick, as delta bases; the newest one applied
+        self._received = {}
+        self.tick_applied = 0
+        self.rtt = None
+
+        # How far each snapshot moved the predicted paddle and ball, in pixels
+        self.paddle_corrections = deque(maxlen=1024)
+        self.ball_corrections = deque(maxlen=1024)
+
+    def try_connect(self):
+        """Say hello (every HELLO_INTERVAL) and check for an answer; True once joined"""
+        now = time.perf_counter()
+        if self.game is None and now >= self._next_hello:
+            self._next_hello = now + HELLO_INTERVAL
+            self.send(_pack(HELLO, HELLO_BODY.pack(VERSION)))
+        self._receive()
+        return self.game is not None
+
+    def connect(self, timeout=10.0):
+        """Wait for the host to answer; returns the mirrored GameState"""
+        deadline = time.perf_counter() + timeout
+        while not self.try_connect():
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"no answer from {self.peer[0]}:{self.peer[1]}")
+            time.sleep(0.01)
+        return self.game
+
+    def _receive(self):
+        events = []
+        newest = None
+        for kind, body, addr in self.packets():
+            if addr != self.peer:
+                continue
+            try:
+                if kind == WELCOME and self.game is None:
+                    self._welcome(body)
+                elif kind == SNAPSHOT and self.game is not None:
+                    snapshot = self._read_snapshot(body, events)
+                    if snapshot is not None and (newest is None or snapshot[0] > newest[0]):
+                        newest = snapshot
+            except (ValueError, struct.error, IndexError):
+                continue
+        if newest is not None and newest[0] > self.tick_applied:
+            self._apply(*newest)
+        return events
+
+    def _welcome(self, body):
+        version, tick_rate, branches = WELCOME_BODY.unpack_from(body)
+        if version != VERSION:
+            raise ValueError(f"host speaks protocol version {version}")
+        self.game = GameState(tick_rate=tick_rate, branches=branches)
+        self.input_interval = max(1, round(tick_rate / INPUT_RATE))
+
+    def _read_snapshot(self, body, events):
+        # (tick, acked seq, fields) of one snapshot, filled in from its
+        # base; its events are added to `events`
+        tick, base_tick, acked_seq, echo_ms, hold_ms, mask = SNAPSHOT_BODY.unpack_from(body)
+        if base_tick:
+            base = self._received.get(base_tick)
+            if base is None:
+                return None
+        else:
+            base = {}
+        fields = dict(base)
+        offset = SNAPSHOT_BODY.size
+        for bit, name in enumerate(FIELDS):
+            if not mask >> bit & 1:
+                continue
+            size, = FIELD_LENGTH.unpack_from(body, offset)
+            offset += FIELD_LENGTH.size
+            data = body[offset:offset + size]
+            offset += size
+            if name == "events":
+                events.extend(decode_events(data))
+            else:
+                fields[name] = data
+        if len(fields) < len(FIELDS) - 1:
+            raise ValueError("snapshot is missing fields")
+
+        if tick not in self._received:
+            self._received[tick] = fields
+            if len(self._received) > HISTORY:
+                del self._received[min(self._received)]
+        if echo_ms and tick > self.tick_applied:
+            sample = ((_now_ms() - echo_ms) & 0xFFFFFFFF) - hold_ms
+            if 0 <= sample < 10_000:
+                sample /= 1000
+                self.rtt = sample if self.rtt is None else self.rtt + (sample - self.rtt) * RTT_SMOOTHING
+        return tick, acked_seq, fields
+
+    def _apply(self, tick, acked_seq, fields):
+        game = self.game
+        balls = game.balls
+        predicted_paddle = game.opponent.y
+        active = game.branch
+        predicted_ball = balls.position(active) if active is not None else None
+
+        player_y, opponent_y = (np.frombuffer(fields["paddles"], "<i2") / POSITION_SCALE).tolist()
+        game.player.y = player_y
+        # The host's paddle, moved on by the inputs it hasn't played yet
+        pending = self._pending
+        while pending and pending[0][0] <= acked_seq:
+            pending.popleft()
+        game.opponent.y = opponent_y
+        for _, bits in pending:
+            game.steer(game.opponent, bits)
+
+        game.player_score, game.opponent_score = SCORE.unpack(fields["score"])
+        scored, branch = ROUND.unpack(fields["round"])
+        game.phase = SCORED if scored else PLAYING
+        if branch == NO_BRANCH:
+            game.branch = None
+            game.ball_state = "superposition"
+        else:
+            game.branch = branch
+            game.ball_state = format(branch, f"0{game.qubit.n}b")
+        game.state_label = _read_text(fields["label"])[0]
+
+        data = fields["balls"]
+        mask, = BALL_MASK.unpack_from(data)
+        visible = [i for i in range(game.branches) if mask >> i & 1]
+        values = np.frombuffer(data, "<i2", offset=BALL_MASK.size).reshape(-1, 4) / BALL_SCALES
+        balls.x[visible], balls.y[visible], balls.dx[visible], balls.dy[visible] = values.T
+        balls.show(visible)
+
+        self._apply_powerups(fields["powerups"])
+        data = fields["messages"]
+        game.collapse_message, offset = _read_text(data)
+        game.powerup_message, offset = _read_text(data, offset)
+        game.powerup_msg_time, = MESSAGE_TIME.unpack_from(data, offset)
+
+        # The snapshot is half a round trip old; catch the ball up to now,
+        # less the tick that tick() is about to run
+        lead = 0
+        if self.rtt is not None:
+            lead = min(max(round(self.rtt / 2 * game.tick_rate) - 1, 0), MAX_LEAD_TICKS)
+        game.frame = tick + lead
+        game.time = game.frame * game.scale
+        if game.phase == PLAYING:
+            self._advance(lead)
+        self.tick_applied = tick
+
+        self.paddle_corrections.append(abs(game.opponent.y - predicted_paddle))
+        if predicted_ball is not None and game.branch == active:
+            x, y = balls.position(active)
+            self.ball_corrections.append(np.hypot(x - predicted_ball[0], y - predicted_ball[1]))
+
+    def _apply_powerups(self, data):
+        game = self.game
+        # Keep the objects of power-ups already on screen
+        existing = {pu.serial: pu for pu in game.powerups}
+        powerups = []
+        for i in range(data[0]):
+            serial, gate, x, y = POWERUP.unpack_from(data, 1 + i * POWERUP.size)
+            pu = existing.get(serial)
+            if pu is None:
+                pu = FallingGate(chr(gate), 0, serial)
+            pu.rect.x = x / POSITION_SCALE
+            pu.rect.y = y / POSITION_SCALE
+            powerups.append(pu)
+        game.powerups = powerups
+
+    def _advance(self, ticks):
+        # Move the ball branches on screen with the host's physics; the host
+        # alone decides collapses and scores
+        game = self.game
+        balls = game.balls
+        scale = game.scale
+        paddles = game.paddles
+        for i in balls.on_screen():
+            x, y, dx, dy = balls.x.item(i), balls.y.item(i), balls.dx.item(i), balls.dy.item(i)
+            for _ in range(ticks):
+                x, y, dx, dy, _, _ = move_ball(x, y, dx, dy, scale, paddles)
+            balls.x[i], balls.y[i], balls.dx[i], balls.dy[i] = x, y, dx, dy
+
+    def tick(self, inputs):
+        """Predict one tick of the mirrored game; returns the host's effects"""
+        game = self.game
+        game.store_previous_positions()
+        events = self._receive()
+
+        self.seq += 1
+        self._pending.append((self.seq, inputs))
+        game.frame += 1
+        game.time += game.scale
+        game.steer(game.opponent, inputs)
+        if game.phase == PLAYING:
+            self._advance(1)
+
+        if self.seq % self.input_interval == 0:
+            self.send_inputs()
+        return events
+
+    def send_inputs(self):
+        """Send every input the host hasn't acknowledged, run-length encoded"""
+        pending = self._pending
+        while len(pending) > MAX_UNACKED:
+            pending.popleft()
+        runs = bytearray()
+        last, count = None, 0
+        for _, bits in pending:
+            if bits == last and count < MAX_RUN:
+                count += 1
+                continue
+            if count:
+                runs += bytes((last, count))
+            last, count = bits, 1
+        if count:
+            runs += bytes((last, count))
+        first = pending[0][0] if pending else self.seq + 1
+        self.send(_pack(INPUTS, INPUTS_BODY.pack(_now_ms(), self.tick_applied, first) + bytes(runs)))
+
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) if len(values) else 0.0
+
+
+def loopback(seconds=10.0, latency=0.1, jitter=0.01, loss=0.0, seed=1):
+    """Play a host and a client against each other over 127.0.0.1, in real time.
+
+    Both sides are tracking AIs and the client taps H every few seconds.
+    latency is the round trip and jitter its spread, in seconds; each end
+    adds half. Returns bandwidth and prediction statistics.
+    """
+    link = {"latency": latency / 2, "jitter": jitter / 2, "loss": loss}
+    host = Host(GameState(seed=seed), port=0, address="127.0.0.1", seed=seed, **link)
+    client = Client("127.0.0.1", host.address[1], seed=seed + 1, **link)
+    try:
+        deadline = time.perf_counter() + 10
+        while not client.try_connect():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("the loopback host never answered")
+            host.tick(0)
+            time.sleep(0.005)
+
+        mirror = client.game
+        tick_rate = mirror.tick_rate
+        ball_errors = []
+        start = next_tick = time.perf_counter()
+        ticks = int(seconds * tick_rate)
+        for t in range(ticks):
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_tick += 1 / tick_rate
+            host.tick(track_ball(host.game))
+            gate = INPUT_H if t % (3 * tick_rate) == 0 else 0
+            client.tick(track_ball(mirror, mirror.opponent) | gate)
+
+            # How far the client's ball is from the host's at the same moment
+            game = host.game
+            if (game.phase == PLAYING and mirror.phase == PLAYING and
+                    game.branch is not None and game.branch == mirror.branch):
+                hx, hy = game.balls.position(game.branch)
+                cx, cy = mirror.balls.position(mirror.branch)
+                ball_errors.append(np.hypot(hx - cx, hy - cy))
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+        host.close()
+
+    return {
+        "seconds": elapsed,
+        "host_kbps": host.bytes_sent / elapsed / 1024,
+        "client_kbps": client.bytes_sent / elapsed / 1024,
+        "snapshots_sent": host.packets_sent,
+        "snapshots_received": client.packets_received,
+        "rtt_ms": (client.rtt or 0) * 1000,
+        "ball_error_px": float(np.mean(ball_errors)) if ball_errors else 0.0,
+        "ball_error_p95_px": _percentile(ball_errors, 95),
+        "ball_correction_p95_px": _percentile(client.ball_corrections, 95),
+        "paddle_correction_p95_px": _percentile(client.paddle_corrections, 95),
+        "score": (host.game.player_score, host.game.opponent_score),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quantum_pong.net", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    host_parser = commands.add_parser("host", help="wait for a player and host the match")
+    host_parser.add_argument("--port", type=int, default=NET_PORT)
+    join_parser = commands.add_parser("join", help="join a hosted match")
+    join_parser.add_argument("address", help="HOST or HOST:PORT")
+    loop_parser = commands.add_parser("loopback", help="headless host and client on this machine")
+    loop_parser.add_argument("--seconds", type=float, default=10.0)
+    for command in (host_parser, join_parser, loop_parser):
+        command.add_argument("--latency", type=float, default=0.0, help="simulated round trip, ms")
+        command.add_argument("--jitter", type=float, default=0.0, help="simulated round-trip jitter, ms")
+        command.add_argument("--loss", type=float, default=0.0, help="fraction of packets dropped")
+    args = parser.parse_args(argv)
+    link = {"latency": args.latency / 2000, "jitter": args.jitter / 2000, "loss": args.loss}
+
+    if args.command == "loopback":
+        stats = loopback(args.seconds, link["latency"] * 2, link["jitter"] * 2, args.loss)
+        print(f"{stats['seconds']:.1f}s over loopback, {args.latency:g} ms round trip "
+              f"(measured {stats['rtt_ms']:.0f} ms), {args.loss:.0%} loss")
+        print(f"host -> client  {stats['host_kbps']:.2f} KB/s, "
+              f"{stats['snapshots_received']} of {stats['snapshots_sent']} packets arrived")
+        print(f"client -> host  {stats['client_kbps']:.2f} KB/s")
+        print(f"ball off the host's by {stats['ball_error_px']:.1f} px on average, "
+              f"{stats['ball_error_p95_px']:.1f} px p95")
+        print(f"snapshot corrections p95: ball {stats['ball_correction_p95_px']:.1f} px, "
+              f"paddle {stats['paddle_correction_p95_px']:.1f} px")
+        return 0
+
+    # The windowed game is only needed past this point
+    from .app import main as run_app
+    if args.command == "host":
+        net = Host(GameState(), port=args.port, **link)
+    else:
+        address, _, port = args.address.partition(":")
+        net = Client(address, int(port or NET_PORT), **link)
+        try:
+            net.connect()
+        except TimeoutError as error:
+            net.close()
+            print(error)
+            return 1
+    run_app(net=net)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
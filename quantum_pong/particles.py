@@ -0,0 +1,131 @@
+import numpy as np
+
+from .constants import PARTICLE_DAMPING
+
+
+class ParticlePool:
+    """Fixed-capacity particle storage kept in parallel NumPy arrays.
+
+    Spawning pops slots off a free-slot stack, update() moves and damps every
+    live particle in one vectorized pass and pushes expired slots back, so no
+    Python objects are created or collected per particle. When the pool is
+    full, new particles overwrite live ones in round-robin order. Below
+    that, `limit` caps the live count and particles past it are dropped.
+    """
+
+    def __init__(self, capacity, rng=None):
+        self.capacity = capacity
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.max_lifetime = np.ones(capacity, dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Free slots are free[:free_top]; the top of the stack is popped first
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.intp)
+        self._free_top = capacity
+        self._steal_cursor = 0
+        self.count = 0
+        self.limit = capacity
+
+    def __len__(self):
+        return self.count
+
+    def _take_slots(self, count):
+        count = min(count, self.capacity)
+        from_free = max(0, min(count, self._free_top, self.limit - self.count))
+        self._free_top -= from_free
+        slots = self._free[self._free_top:self._free_top + from_free].copy()
+        self.count += from_free
+
+        # Only a completely full pool recycles; under a lower limit the rest is dropped
+        stolen = count - from_free if not self._free_top else 0
+        if stolen:
+            # Pool is full: recycle live particles, oldest slots first
+            if from_free:
+                # Only particles live before this call; alive isn't set yet
+                # for the slots just popped, so they are skipped
+                order = (self._steal_cursor + np.arange(self.capacity)) % self.capacity
+                extra = order[self.alive[order]][:stolen]
+            else:
+                extra = (self._steal_cursor + np.arange(stolen)) % self.capacity
+            self._steal_cursor = int(extra[-1] + 1) % self.capacity
+            slots = np.concatenate((slots, extra))
+        return slots
+
+    def spawn(self, xs, ys, vxs, vys, sizes, colors, lifetimes):
+        """Place particles with explicit per-particle values (arrays or scalars)"""
+        slots = self._take_slots(len(np.atleast_1d(xs)))
+        n = len(slots)
+        if not n:
+            return
+
+        def fit(values, ndim=1):
+            # Per-particle arrays are cut to the slots actually granted
+            values = np.asarray(values)
+            return values[:n] if values.ndim == ndim else values
+
+        self.x[slots] = np.broadcast_to(fit(xs), n)
+        self.y[slots] = np.broadcast_to(fit(ys), n)
+        self.vx[slots] = np.broadcast_to(fit(vxs), n)
+        self.vy[slots] = np.broadcast_to(fit(vys), n)
+        self.size[slots] = np.broadcast_to(fit(sizes), n)
+        self.color[slots] = fit(colors, 2)
+        self.lifetime[slots] = np.broadcast_to(fit(lifetimes), n)
+        self.max_lifetime[slots] = np.maximum(self.lifetime[slots], 1)
+        self.alive[slots] = True
+
+    def emit(self, x, y, color, count=8, lifetime=(20, 40)):
+        """Burst of particles from one point, like the old create_explosion"""
+        count = min(count, self.capacity)
+        if count <= 0:
+            return
+        rng = self.rng
+        self.spawn(
+            np.full(count, x, dtype=np.float32),
+            y,
+            rng.uniform(-3, 3, count),
+            rng.uniform(-3, 3, count),
+            rng.uniform(2, 6, count),
+            color[:3],
+            rng.integers(lifetime[0], lifetime[1], count, endpoint=True),
+        )
+
+    def update(self, damping=PARTICLE_DAMPING, scale=1.0):
+        """Advance by `scale` 60 FPS frames"""
+        live = self.alive
+        if not self.count:
+            return
+        step = live * np.float32(scale)
+        self.x += self.vx * step
+        self.y += self.vy * step
+        if scale != 1.0:
+            damping = damping ** scale
+        self.vx *= damping
+        self.vy *= damping
+        self.lifetime -= step
+
+        expired = np.flatnonzero(live & (self.lifetime <= 0))
+        if len(expired):
+            self.alive[expired] = False
+            self._free[self._free_top:self._free_top + len(expired)] = expired
+            self._free_top += len(expired)
+            self.count -= len(expired)
+
+    def clear(self):
+        self.alive[:] = False
+        self._free = np.arange(self.capacity - 1, -1, -1, dtype=np.intp)
+        self._free_top = self.capacity
+        self.count = 0
+
+    def splats(self):
+        """(xs, ys, radii, colors, alphas) of the live particles, for an EffectCompositor"""
+        slots = np.flatnonzero(self.alive)
+        alphas = 255 * np.clip(self.lifetime[slots] / self.max_lifetime[slots], 0, 1)
+        return self.x[slots], self.y[slots], self.size[slots], self.color[slots], alphas
@@ -0,0 +1,174 @@
+"""Swept (continuous) collision for balls against walls and paddles.
+
+Balls are circles of BALL_RADIUS moving in a straight line for the length
+of one tick. Rather than moving first and testing for overlap, each solver
+returns the exact fraction of the tick at which the circle first touches a
+surface, so fast balls can neither tunnel through a 10 px paddle nor flip
+direction twice while still inside it.
+"""
+import math
+
+from .constants import HEIGHT, BALL_RADIUS
+
+# Most surfaces a ball can touch within a single tick
+MAX_BOUNCES = 4
+
+# Contacts closer than this (in tick fractions) count as the same instant
+EPSILON = 1e-9
+
+
+def sweep_wall(cy, vy, radius=BALL_RADIUS, height=HEIGHT):
+    """Time of impact in [0, 1] of a circle center against the top/bottom walls"""
+    if vy < 0:
+        t = (radius - cy) / vy
+    elif vy > 0:
+        t = (height - radius - cy) / vy
+    else:
+        return None
+    if -EPSILON <= t <= 1:
+        return max(t, 0.0)
+    return None
+
+
+def _sweep_corner(cx, cy, vx, vy, px, py, radius):
+    # Circle center moving along v against a point: |c + v t - p| = radius
+    fx = cx - px
+    fy = cy - py
+    a = vx * vx + vy * vy
+    b = fx * vx + fy * vy
+    if b >= 0 or a == 0:
+        return None  # Moving away from the corner
+    c = fx * fx + fy * fy - radius * radius
+    disc = b * b - a * c
+    if disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    if -EPSILON <= t <= 1:
+        return max(t, 0.0)
+    return None
+
+
+def sweep_circle_rect(cx, cy, vx, vy, left, top, right, bottom, radius=BALL_RADIUS):
+    """Earliest contact of a moving circle with a rectangle during one tick.
+
+    Returns (t, nx, ny): t in [0, 1] and the unit surface normal at the
+    contact, or None if there is no approaching contact this tick.
+    """
+    best = None
+
+    # Side faces, pushed out by the radius
+    if vx > 0:
+        t = (left - radius - cx) / vx
+        if -EPSILON <= t <= 1 and top <= cy + vy * t <= bottom:
+            best = (max(t, 0.0), -1.0, 0.0)
+    elif vx < 0:
+        t = (right + radius - cx) / vx
+        if -EPSILON <= t <= 1 and top <= cy + vy * t <= bottom:
+            best = (max(t, 0.0), 1.0, 0.0)
+
+    # Top and bottom faces
+    if vy > 0:
+        t = (top - radius - cy) / vy
+        if -EPSILON <= t <= 1 and left <= cx + vx * t <= right:
+            if best is None or t < best[0]:
+                best = (max(t, 0.0), 0.0, -1.0)
+    elif vy < 0:
+        t = (bottom + radius - cy) / vy
+        if -EPSILON <= t <= 1 and left <= cx + vx * t <= right:
+            if best is None or t < best[0]:
+                best = (max(t, 0.0), 0.0, 1.0)
+
+    # Rounded corners
+    for px in (left, right):
+        for py in (top, bottom):
+            t = _sweep_corner(cx, cy, vx, vy, px, py, radius)
+            if t is not None and (best is None or t < best[0]):
+                hx = cx + vx * t - px
+                hy = cy + vy * t - py
+                length = math.hypot(hx, hy) or 1.0
+                best = (t, hx / length, hy / length)
+    return best
+
+
+def _overlaps(cx, cy, left, top, right, bottom, radius):
+    nx = min(max(cx, left), right)
+    ny = min(max(cy, top), bottom)
+    return (cx - nx) ** 2 + (cy - ny) ** 2 < radius * radius
+
+
+def move_ball(x, y, dx, dy, scale, paddles, radius=BALL_RADIUS):
+    """Move a ball through one tick, bouncing off walls and paddles.
+
+    (x, y) is the top-left corner of the ball's box; dx and dy are per 60
+    FPS frame, scaled by `scale` for the tick. Returns (x, y, dx, dy,
+    wall_contact, paddle_contact) where the contacts are the ball center at
+    the first impact of that kind this tick, or None.
+    """
+    cx = x + radius
+    cy = y + radius
+    vx = dx * scale
+    vy = dy * scale
+    wall_contact = None
+    paddle_contact = None
+
+    # A paddle that moved into the ball, or a ball spawned past a wall,
+    # gets a plain discrete response first
+    for paddle in paddles:
+        px_center = paddle.x + paddle.w / 2
+        if vx * (px_center - cx) > 0 and _overlaps(
+                cx, cy, paddle.x, paddle.y, paddle.x + paddle.w, paddle.y + paddle.h, radius):
+            dx, vx = -dx, -vx
+            paddle_contact = (cx, cy)
+    if (cy < radius and vy < 0) or (cy > HEIGHT - radius and vy > 0):
+        dy, vy = -dy, -vy
+        wall_contact = (cx, cy)
+
+    remaining = 1.0
+    for _ in range(MAX_BOUNCES):
+        t = sweep_wall(cy, vy, radius)
+        hit_wall = t is not None
+        nx, ny = 0.0, 1.0
+        for paddle in paddles:
+            # Skip paddles the swept circle's bounding box can't reach
+            if (min(cx, cx + vx) - radius > paddle.x + paddle.w or
+                    max(cx, cx + vx) + radius < paddle.x or
+                    min(cy, cy + vy) - radius > paddle.y + paddle.h or
+                    max(cy, cy + vy) + radius < paddle.y):
+                continue
+            contact = sweep_circle_rect(cx, cy, vx, vy, paddle.x, paddle.y,
+                                        paddle.x + paddle.w, paddle.y + paddle.h, radius)
+            if contact is not None and (t is None or contact[0] < t):
+                t, nx, ny = contact
+                hit_wall = False
+
+        if t is None:
+            cx += vx
+            cy += vy
+            break
+
+        # Advance to the contact, reflect about the normal, spend the rest of the tick
+        cx += vx * t
+        cy += vy * t
+        rest = 1 - t
+        if nx == 0.0:
+            dy = -dy
+            vx, vy = vx * rest, -vy * rest
+        elif ny == 0.0:
+            dx = -dx
+            vx, vy = -vx * rest, vy * rest
+        else:
+            # Corner: mirror the velocity, keeping its speed
+            dot = dx * nx + dy * ny
+            dx, dy = dx - 2 * dot * nx, dy - 2 * dot * ny
+            dot = vx * nx + vy * ny
+            vx, vy = (vx - 2 * dot * nx) * rest, (vy - 2 * dot * ny) * rest
+        if hit_wall:
+            if wall_contact is None:
+                wall_contact = (cx, cy)
+        elif paddle_contact is None:
+            paddle_contact = (cx, cy)
+        remaining *= rest
+        if remaining <= EPSILON:
+            break
+
+    return cx - radius, cy - radius, dx, dy, wall_contact, paddle_contact
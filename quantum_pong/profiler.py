@@ -0,0 +1,91 @@
+import csv
+import time
+
+import numpy as np
+
+from .constants import PROFILE_FRAMES
+
+# Main loop phases, in the order they run within a frame
+PHASES = (
+    "tick_wait", "input", "ai", "powerup_update", "physics", "events",
+    "background", "background_particles", "trails", "particles", "paddles", "balls",
+    "powerup_draw", "flash", "hud", "messages", "overlay", "flip", "capture",
+)
+
+
+def skip_lap(phase):
+    """Stand-in for FrameProfiler.lap when nothing is being profiled"""
+
+
+class FrameProfiler:
+    """Per-phase frame timings kept in a fixed-size ring buffer.
+
+    The loop calls lap(phase) as each phase finishes; the time since the
+    previous lap is charged to that phase, so every microsecond of the frame
+    lands in exactly one column and a lap costs one clock read. Phases that
+    run once per tick (AI, physics) add up over the frame's ticks.
+    end_frame() commits the row along with the number of surfaces allocated
+    during the frame.
+    """
+
+    def __init__(self, capacity=PROFILE_FRAMES, phases=PHASES, clock=time.perf_counter):
+        self.capacity = capacity
+        self.phases = phases
+        self.clock = clock
+        self._columns = {name: i for i, name in enumerate(phases)}
+        self.times = np.zeros((capacity, len(phases)))
+        self.allocations = np.zeros(capacity, dtype=np.int64)
+        self.frames = 0
+        self.visible = False
+
+        self._current = [0.0] * len(phases)
+        self._last = clock()
+        self._allocation_total = None
+
+    def __len__(self):
+        return min(self.frames, self.capacity)
+
+    def lap(self, phase):
+        now = self.clock()
+        self._current[self._columns[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self, allocation_total=0):
+        """Store the frame; allocation_total is a running count of surfaces created"""
+        row = self.frames % self.capacity
+        self.times[row] = self._current
+        if self._allocation_total is not None:
+            self.allocations[row] = allocation_total - self._allocation_total
+        self._allocation_total = allocation_total
+        self._current = [0.0] * len(self.phases)
+        self.frames += 1
+
+    def history(self):
+        """(times, allocations) of the buffered frames, oldest first"""
+        count = len(self)
+        if count < self.capacity:
+            return self.times[:count], self.allocations[:count]
+        start = self.frames % self.capacity
+        order = np.r_[start:self.capacity, 0:start]
+        return self.times[order], self.allocations[order]
+
+    def summary(self):
+        """[(phase, p50 ms, p99 ms)] over the buffered frames, plus a 'frame' total"""
+        times, _ = self.history()
+        if not len(times):
+            return []
+        times = np.column_stack((times, times.sum(axis=1))) * 1000
+        p50, p99 = np.percentile(times, (50, 99), axis=0)
+        names = self.phases + ("frame",)
+        return list(zip(names, p50.tolist(), p99.tolist()))
+
+    def export_csv(self, path):
+        times, allocations = self.history()
+        first = self.frames - len(times)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame",) + tuple(f"{name}_ms" for name in self.phases)
+                            + ("total_ms", "allocations"))
+            for i, (row, allocated) in enumerate(zip(times.tolist(), allocations.tolist())):
+                writer.writerow([first + i] + [f"{t * 1000:.4f}" for t in row]
+                                + [f"{sum(row) * 1000:.4f}", allocated])
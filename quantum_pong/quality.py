@@ -0,0 +1,84 @@
+from collections import deque
+
+from .constants import FRAME_RATE, MAX_PARTICLES, BACKGROUND_PARTICLES
+
+# Effect settings from cheapest to richest. "high" is what the game shipped
+# with; "ultra" restores the original effects that were cut for speed.
+QUALITY_TIERS = (
+    {"name": "low", "particle_scale": 0.25, "max_particles": 256, "trail_length": 3,
+     "glow_layers": 0, "background_particles": 0, "gradient_band": 16},
+    {"name": "medium", "particle_scale": 0.5, "max_particles": 1024, "trail_length": 5,
+     "glow_layers": 1, "background_particles": 10, "gradient_band": 8},
+    {"name": "high", "particle_scale": 1.0, "max_particles": MAX_PARTICLES, "trail_length": 8,
+     "glow_layers": 2, "background_particles": BACKGROUND_PARTICLES, "gradient_band": 4},
+    {"name": "ultra", "particle_scale": 2.0, "max_particles": MAX_PARTICLES, "trail_length": 12,
+     "glow_layers": 5, "background_particles": 50, "gradient_band": 1},
+)
+DEFAULT_TIER = 2
+
+# Frame work (everything but waiting for the next frame) as a share of the
+# frame budget: above DOWNGRADE_AT drops a tier, below UPGRADE_AT gains one
+DOWNGRADE_AT = 0.85
+UPGRADE_AT = 0.45
+
+# Downgrades react within half a second, upgrades need two calm seconds,
+# and any change is followed by a settling period
+DOWNGRADE_WINDOW = 30
+UPGRADE_WINDOW = 120
+SETTLE_FRAMES = 90
+
+# Percentile of the window compared against the thresholds
+WINDOW_PERCENTILE = 0.9
+
+
+class QualityGovernor:
+    """Moves between QUALITY_TIERS to keep frame work under a time budget.
+
+    update() takes the milliseconds each frame spent working. Thresholds
+    far apart, a longer window for upgrading than for downgrading and a
+    settling period after every change keep it from oscillating around
+    the budget.
+    """
+
+    def __init__(self, budget_ms=1000 / FRAME_RATE, tier=DEFAULT_TIER, tiers=QUALITY_TIERS):
+        self.budget_ms = budget_ms
+        self.tiers = tiers
+        self.tier = tier
+        self.frame_times = deque(maxlen=UPGRADE_WINDOW)
+        self._settle = SETTLE_FRAMES
+
+    @property
+    def settings(self):
+        return self.tiers[self.tier]
+
+    @property
+    def name(self):
+        return self.tiers[self.tier]["name"]
+
+    def _recent(self, count):
+        times = sorted(list(self.frame_times)[-count:])
+        return times[min(len(times) - 1, int(len(times) * WINDOW_PERCENTILE))]
+
+    def update(self, work_ms):
+        """Record a frame; returns the new tier index if it changed, else None"""
+        self.frame_times.append(work_ms)
+        if self._settle > 0:
+            self._settle -= 1
+            return None
+
+        new_tier = None
+        frames = len(self.frame_times)
+        if (self.tier > 0 and frames >= DOWNGRADE_WINDOW and
+                self._recent(DOWNGRADE_WINDOW) > self.budget_ms * DOWNGRADE_AT):
+            new_tier = self.tier - 1
+        elif (self.tier < len(self.tiers) - 1 and frames >= UPGRADE_WINDOW and
+                self._recent(UPGRADE_WINDOW) < self.budget_ms * UPGRADE_AT):
+            new_tier = self.tier + 1
+        if new_tier is None:
+            return None
+
+        self.tier = new_tier
+        # Times measured at the old tier say nothing about the new one
+        self.frame_times.clear()
+        self._settle = SETTLE_FRAMES
+        return new_tier
@@ -0,0 +1,231 @@
+"""Amplitude-based qubit register with strided gate kernels.
+
+The state of n qubits is a complex vector of 2**n amplitudes, and qubit k
+is bit k of the index. A one-qubit gate never builds a 2**n x 2**n matrix.
+The vector is viewed as (2**(n-k-1), 2, 2**k), so that axis 1 is qubit k,
+and the 2x2 gate mixes the two halves in place in O(2**n). Controlled
+gates do the same on the slice where the control bit is 1. Measurement
+follows the Born rule: an outcome is drawn with probability equal to its
+squared amplitude, and the state is projected and renormalized.
+"""
+import math
+
+import numpy as np
+
+SQRT_HALF = 1 / math.sqrt(2)
+
+# Single-qubit gates by name
+GATES = {
+    "I": np.array([[1, 0], [0, 1]], dtype=complex),
+    "X": np.array([[0, 1], [1, 0]], dtype=complex),
+    "Y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "Z": np.array([[1, 0], [0, -1]], dtype=complex),
+    "H": np.array([[1, 1], [1, -1]], dtype=complex) * SQRT_HALF,
+    "S": np.array([[1, 0], [0, 1j]], dtype=complex),
+    "T": np.array([[1, 0], [0, np.exp(1j * math.pi / 4)]], dtype=complex),
+}
+
+# Amplitudes below this are treated as zero when naming states
+EPSILON = 1e-9
+
+
+def rx(theta):
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]], dtype=complex)
+
+
+def ry(theta):
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def rz(theta):
+    return np.array([[np.exp(-0.5j * theta), 0], [0, np.exp(0.5j * theta)]], dtype=complex)
+
+
+class QubitRegister:
+    def __init__(self, n=1):
+        if n < 1:
+            raise ValueError("a register needs at least one qubit")
+        self.n = n
+        self.state = np.zeros(2 ** n, dtype=complex)
+        self.state[0] = 1
+
+    def reset(self):
+        """Back to |00...0>"""
+        self.state[:] = 0
+        self.state[0] = 1
+
+    def _check(self, qubit):
+        if not 0 <= qubit < self.n:
+            raise IndexError(f"qubit {qubit} out of range for {self.n} qubits")
+
+    def _split(self, qubit):
+        # View with qubit's bit on axis 1: [..., 0, ...] has it clear, [..., 1, ...] set
+        self._check(qubit)
+        return self.state.reshape(2 ** (self.n - qubit - 1), 2, 2 ** qubit)
+
+    def apply(self, gate, qubit):
+        """Apply a 2x2 unitary (or a GATES name) to one qubit"""
+        if isinstance(gate, str):
+            name, gate = gate, GATES[gate]
+        else:
+            name = None
+        view = self._split(qubit)
+        low, high = view[:, 0, :], view[:, 1, :]
+        # Cheap kernels for the gates the game uses every frame
+        if name == "X":
+            view[:, [0, 1], :] = view[:, [1, 0], :]
+        elif name == "Z":
+            high *= -1
+        elif name == "I":
+            pass
+        else:
+            _mix(gate, low, high)
+
+    def apply_all(self, gate):
+        """Apply the same one-qubit gate to every qubit"""
+        for qubit in range(self.n):
+            self.apply(gate, qubit)
+
+    def x(self, qubit=0):
+        self.apply("X", qubit)
+
+    def y(self, qubit=0):
+        self.apply("Y", qubit)
+
+    def z(self, qubit=0):
+        self.apply("Z", qubit)
+
+    def h(self, qubit=0):
+        self.apply("H", qubit)
+
+    def controlled(self, gate, control, target):
+        """Apply gate to `target` on the part of the state where `control` is 1"""
+        if control == target:
+            raise ValueError("control and target must differ")
+        if isinstance(gate, str):
+            gate = GATES[gate]
+        self._check(control)
+        self._check(target)
+        # One axis per qubit, highest qubit first. Length-1 slices rather
+        # than ints keep low and high views even when every axis is fixed
+        cube = self.state.reshape((2,) * self.n)
+        index = [slice(None)] * self.n
+        index[self.n - 1 - control] = slice(1, 2)
+        index[self.n - 1 - target] = slice(0, 1)
+        low = cube[tuple(index)]
+        index[self.n - 1 - target] = slice(1, 2)
+        high = cube[tuple(index)]
+        _mix(gate, low, high)
+
+    def cnot(self, control, target):
+        self.controlled("X", control, target)
+
+    def cz(self, control, target):
+        self.controlled("Z", control, target)
+
+    def probability(self, qubit=0):
+        """Chance that measuring `qubit` gives 1"""
+        view = self._split(qubit)
+        return float(np.vdot(view[:, 1, :], view[:, 1, :]).real)
+
+    def probabilities(self):
+        """Chance of each basis state"""
+        return self.state.real ** 2 + self.state.imag ** 2
+
+    def project(self, qubit, outcome):
+        """Collapse `qubit` onto |outcome>, as if it had been measured so"""
+        view = self._split(qubit)
+        view[:, 1 - outcome, :] = 0
+        norm = np.linalg.norm(self.state)
+        if norm < EPSILON:
+            raise ValueError(f"qubit {qubit} has no |{outcome}> amplitude to collapse onto")
+        self.state /= norm
+
+    def measure(self, qubit, rng):
+        """Born-rule measurement of one qubit; rng needs a random() method"""
+        outcome = 1 if rng.random() < self.probability(qubit) else 0
+        self.project(qubit, outcome)
+        return outcome
+
+    def measure_all(self, rng):
+        """Measure every qubit in turn; returns the basis state index it collapsed to"""
+        index = 0
+        for qubit in range(self.n):
+            index |= self.measure(qubit, rng) << qubit
+        return index
+
+    def project_basis(self, index):
+        """Collapse the whole register onto basis state |index>, keeping its phase"""
+        amplitude = self.state[index]
+        if abs(amplitude) < EPSILON:
+            raise ValueError(f"basis state {index} has no amplitude to collapse onto")
+        self.state[:] = 0
+        self.state[index] = amplitude / abs(amplitude)
+
+    def is_superposed(self, qubit=0):
+        p1 = self.probability(qubit)
+        return EPSILON < p1 < 1 - EPSILON
+
+    def label(self):
+        """Ket notation of the state, e.g. |0>, |+->, or 0.6|0> + 0.8i|1>"""
+        names = self._product_names()
+        if names is not None:
+            return f"|{''.join(names)}>"
+        terms = []
+        for index in np.flatnonzero(np.abs(self.state) > EPSILON):
+            terms.append(f"{_format_amplitude(self.state[index])}|{index:0{self.n}b}>")
+        return " + ".join(terms)
+
+    def _product_names(self):
+        # Names of the one-qubit factors, highest qubit first, if the state
+        # is a product of |0>, |1>, |+>, |->, |i> and |-i>; otherwise None
+        state = self.state
+        anchor = int(np.argmax(np.abs(state)))
+        names = []
+        product = np.ones(1, dtype=complex)
+        for qubit in reversed(range(self.n)):
+            bit = 1 << qubit
+            pair = (state[anchor & ~bit], state[anchor | bit])
+            name = _name_qubit(*pair)
+            if name is None:
+                return None
+            names.append(name)
+            product = np.kron(product, np.array(pair) / np.linalg.norm(pair))
+        # Equal up to a global phase
+        if abs(abs(np.vdot(product, state)) - 1) > 1e-6:
+            return None
+        return names
+
+
+def _name_qubit(a, b):
+    if abs(b) < EPSILON:
+        return "0"
+    if abs(a) < EPSILON:
+        return "1"
+    if abs(abs(a) - abs(b)) < EPSILON:
+        relative = b / a
+        for sign, name in ((1, "+"), (-1, "-"), (1j, "i"), (-1j, "-i")):
+            if abs(relative - sign) < 1e-6:
+                return name
+    return None
+
+
+def _mix(gate, low, high):
+    # In place: (low, high) <- gate @ (low, high), elementwise over the views
+    (a, b), (c, d) = gate
+    old_low = low.copy()
+    low *= a
+    low += b * high
+    high *= d
+    high += c * old_low
+
+
+def _format_amplitude(amp):
+    re, im = round(amp.real, 2), round(amp.imag, 2)
+    if im == 0:
+        return f"{re:g}"
+    if re == 0:
+        return f"{im:g}i"
+    return f"({re:g}{im:+g}i)"
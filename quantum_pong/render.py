@@ -0,0 +1,437 @@
+import math
+
+import numpy as np
+import pygame
+
+from .constants import (
+    WIDTH, HEIGHT, WHITE, BLACK, BLUE, RED, YELLOW, DARK_BLUE, NEON_CYAN,
+    NEON_PINK, BALL_RADIUS, POWERUP_SIZE, MAX_PARTICLES, MAX_BRANCHES,
+    MESSAGE_FRAMES, PROFILE_REFRESH_FRAMES,
+)
+from .compositor import EffectCompositor
+from .particles import ParticlePool
+from .profiler import skip_lap
+from .quality import QUALITY_TIERS, DEFAULT_TIER
+from .sprites import SpriteCache
+from .text import TextCache
+
+# Past this many changed regions a full-screen redraw is cheaper
+MAX_DIRTY_RECTS = 64
+
+SCREEN_RECT = pygame.Rect(0, 0, WIDTH, HEIGHT)
+
+
+class Trail:
+    def __init__(self, max_length=8):
+        self.positions = []
+        self.max_length = max_length
+
+    def add_position(self, x, y):
+        self.positions.append((x, y))
+        if len(self.positions) > self.max_length:
+            del self.positions[:-self.max_length]
+
+    def clear(self):
+        """Clear all trail positions"""
+        self.positions.clear()
+
+    def splats(self):
+        """(xs, ys, radii, alphas) of the trail dots, oldest smallest and faintest"""
+        positions = self.positions
+        count = len(positions)
+        xs, ys, radii, alphas = [], [], [], []
+        for i in range(1, count):
+            # The oldest dot has size 0, and dots too small to show at this
+            # length are skipped too
+            radius = int(BALL_RADIUS * (i / count))
+            if radius > 0:
+                x, y = positions[i]
+                xs.append(x)
+                ys.append(y)
+                radii.append(radius)
+                alphas.append(255 * (i / count))
+        return (xs, ys, radii, alphas) if xs else None
+
+
+def make_powerup_sprite(gate_type, font):
+    surf = pygame.Surface((POWERUP_SIZE, POWERUP_SIZE), pygame.SRCALPHA)
+
+    # Enhanced power-up visuals
+    colors = {'X': (255, 100, 100), 'Z': (255, 255, 100), 'H': (100, 255, 100)}
+    color = colors[gate_type]
+
+    # Draw glowing border
+    pygame.draw.rect(surf, color, (0, 0, 48, 48), 3)
+    pygame.draw.rect(surf, (*color, 100), (3, 3, 42, 42))
+
+    text = font.render(gate_type, True, BLACK)
+    return surf, text
+
+
+class Renderer:
+    """Draws a GameState onto the screen in layers.
+
+    The gradient background, HUD panels and controls hint never change, so
+    they are baked once into `static`. Each frame only the regions that
+    something was drawn into (this frame or the last one) are restored from
+    `static` and pushed with pygame.display.update(); a collapse flash or a
+    screen full of effects falls back to a full blit and flip.
+    """
+
+    def __init__(self, screen, font, small_font, seed=None, quality=QUALITY_TIERS[DEFAULT_TIER]):
+        self.screen = screen
+        self.font = font
+        self.small_font = small_font
+
+        # Pre-rendered glows, dots and panels shared by every draw call
+        self.sprites = SpriteCache()
+        self.sprites.prewarm()
+        self.text = TextCache()
+        for label in ("|+>", "|0>", "|1>"):
+            self.text.render(font, f"State: {label}", NEON_CYAN)
+        for state in ("0", "1"):
+            self.text.render(small_font, state, WHITE)
+
+        # Visual effect objects, on their own RNG so effects never touch gameplay
+        self.rng = np.random.default_rng(seed)
+        self.particles = ParticlePool(MAX_PARTICLES, self.rng)
+        self.background_particles = ParticlePool(
+            max(tier["background_particles"] for tier in QUALITY_TIERS), self.rng)
+        # One trail per ball branch, indexed like GameState.balls
+        self.trails = [Trail() for _ in range(MAX_BRANCHES)]
+        # Particles and trail dots are all drawn in one compositing pass
+        self.compositor = EffectCompositor(self.sprites)
+        self.flash_opacity = 0
+        self.flash_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+
+        # Background particles (reduced for performance) are spawned by the
+        # first draw(), not here
+
+        self._prev_rects = []
+        self._full_redraw = True
+        self._update_rects = None
+
+        # Effect levels, moved at runtime by a QualityGovernor
+        self.quality = None
+        self.static = None
+        self.set_quality(quality)
+
+        # Optional FrameProfiler timing each draw phase, and its overlay
+        self.profiler = None
+        self._overlay = None
+        self._overlay_frame = -PROFILE_REFRESH_FRAMES
+        self._overlay_allocations = 0
+
+    # Static layer ----------------------------------------------------------
+
+    def set_quality(self, settings):
+        """Switch effect levels to one of QUALITY_TIERS"""
+        old = self.quality
+        self.quality = settings
+        self.particle_scale = settings["particle_scale"]
+        self.particles.limit = settings["max_particles"]
+        for trail in self.trails:
+            trail.max_length = settings["trail_length"]
+        self.glow_layers = settings["glow_layers"]
+        if len(self.background_particles) > settings["background_particles"]:
+            self.background_particles.clear()
+        if old is None or old["gradient_band"] != settings["gradient_band"]:
+            self.static = self.bake_static_layer(settings["gradient_band"])
+        self._full_redraw = True
+
+    def bake_static_layer(self, band=4):
+        layer = pygame.Surface((WIDTH, HEIGHT))
+
+        # Gradient in `band`-pixel stripes; wider bands are cheaper to bake
+        for y in range(0, HEIGHT, band):
+            color_ratio = y / HEIGHT
+            r = int(DARK_BLUE[0] * (1 - color_ratio))
+            g = int(DARK_BLUE[1] * (1 - color_ratio))
+            b = int(DARK_BLUE[2] + (100 * color_ratio))
+            pygame.draw.rect(layer, (r, g, b), (0, y, WIDTH, band))
+
+        # HUD chrome: top panel and state box
+        layer.blit(self.sprites.rect(WIDTH, 80, BLACK, 150), (0, 0))
+        layer.blit(self.sprites.rect(140, 30, (0, 255, 255), 50), (WIDTH - 150, 5))
+
+        # Controls hint
+        controls_text = self.small_font.render("Controls: ↑↓ Move | X Z H Gates", True, (150, 150, 150))
+        layer.blit(controls_text, (10, HEIGHT - 25))
+        return layer.convert() if pygame.display.get_surface() else layer
+
+    # Effects ---------------------------------------------------------------
+
+    def create_explosion(self, x, y, color=NEON_CYAN, count=8):  # Reduced from 15 to 8
+        count = max(1, round(count * self.particle_scale))
+        self.particles.emit(x, y, color, count, lifetime=(20, 40))  # Shorter lifetime
+
+    def clear_trail(self, index):
+        self.trails[index].clear()
+
+    def flash(self):
+        self.flash_opacity = 255
+
+    def apply_events(self, events):
+        """Start the effects for a list of GameState.step() events"""
+        for event in events:
+            kind = event[0]
+            if kind == "explosion":
+                self.create_explosion(*event[1:])
+            elif kind == "clear_trail":
+                self.clear_trail(event[1])
+            elif kind == "collapse":
+                self.flash()
+
+    def refill_background_particles(self):
+        # Respawn expired background particles at random spots
+        pool = self.background_particles
+        missing = self.quality["background_particles"] - len(pool)
+        if missing > 0:
+            rng = pool.rng
+            pool.spawn(
+                rng.uniform(0, WIDTH, missing),
+                rng.uniform(0, HEIGHT, missing),
+                rng.uniform(-3, 3, missing),
+                rng.uniform(-3, 3, missing),
+                rng.uniform(2, 6, missing),
+                np.stack((rng.integers(20, 80, missing, endpoint=True),
+                          rng.integers(20, 80, missing, endpoint=True),
+                          rng.integers(100, 255, missing, endpoint=True)), axis=1),
+                1000,  # Use a large finite number instead of infinity
+            )
+
+    def powerup_sprite(self, gate_type):
+        return self.sprites.get(("powerup", gate_type),
+                                lambda: make_powerup_sprite(gate_type, self.font))
+
+    @property
+    def allocations(self):
+        """Surfaces created so far by the sprite and text caches and the profiler overlay"""
+        return self.sprites.allocations + self.text.renders + self._overlay_allocations
+
+    # Drawing ---------------------------------------------------------------
+
+    def draw_enhanced_paddle(self, paddle, y, is_player=True):
+        screen = self.screen
+        paddle_rect = pygame.Rect(paddle.x, y, paddle.w, paddle.h)
+
+        # Main paddle body
+        color = NEON_CYAN if is_player else NEON_PINK
+        pygame.draw.rect(screen, color, paddle_rect)
+
+        # Glow effect
+        glow_rect = paddle_rect.inflate(6, 6)
+        screen.blit(self.sprites.rect(glow_rect.width, glow_rect.height, color, 50), glow_rect.topleft)
+
+        # Energy core
+        core_rect = pygame.Rect(paddle_rect.centerx - 2, paddle_rect.centery - 10, 4, 20)
+        pygame.draw.rect(screen, WHITE, core_rect)
+        return glow_rect
+
+    def draw_quantum_ball(self, center, state, branch=0):
+        screen = self.screen
+        center_x, center_y = center
+
+        if state == "superposition":
+            # Simplified quantum superposition visual, odd branches in swapped colors
+            colors = [NEON_CYAN, NEON_PINK] if branch % 2 == 0 else [NEON_PINK, NEON_CYAN]
+
+            # Glow layers follow the quality tier (2 on "high", was 5)
+            for i in range(self.glow_layers):
+                alpha = max(10, 80 - i * 30)
+                radius = BALL_RADIUS + i * 4
+                screen.blit(self.sprites.circle(radius, colors[0], alpha), (center_x - radius, center_y - radius))
+
+            # Core
+            pygame.draw.circle(screen, colors[0], (center_x, center_y), BALL_RADIUS)
+            pygame.draw.circle(screen, colors[1], (center_x, center_y), BALL_RADIUS - 3)
+
+            # Simplified quantum pattern - only 1 dot instead of 3
+            angle = (pygame.time.get_ticks() * 0.01) % (2 * math.pi)
+            px = center_x + math.cos(angle) * (BALL_RADIUS - 2)
+            py = center_y + math.sin(angle) * (BALL_RADIUS - 2)
+            pygame.draw.circle(screen, WHITE, (int(px), int(py)), 2)
+            reach = BALL_RADIUS + max(0, self.glow_layers - 1) * 4
+        else:
+            # Classical state
+            color = BLUE if branch % 2 == 0 else RED
+            pygame.draw.circle(screen, color, (center_x, center_y), BALL_RADIUS)
+            pygame.draw.circle(screen, WHITE, (center_x, center_y), BALL_RADIUS - 3)
+
+            # State indicator
+            text = self.text.render(self.small_font, state, WHITE)
+            text_rect = screen.blit(text, (center_x - 5 * len(state), center_y - 8))
+            # Labels of several qubits are wider than the ball
+            return text_rect.union((center_x - BALL_RADIUS, center_y - BALL_RADIUS,
+                                    BALL_RADIUS * 2, BALL_RADIUS * 2))
+        return pygame.Rect(center_x - reach, center_y - reach, reach * 2, reach * 2)
+
+    def draw_hud(self, game):
+        screen = self.screen
+
+        # Score with glow effect
+        score_text = self.text.render(self.font, f"Player: {game.player_score}  Opponent: {game.opponent_score}", WHITE)
+        rects = [screen.blit(score_text, (WIDTH // 2 - 100, 10))]
+
+        # Quantum state with enhanced styling
+        state_text = self.text.render(self.font, f"State: {game.state_label}", NEON_CYAN)
+        rects.append(screen.blit(state_text, (WIDTH - 145, 10)))
+
+        # Current effects tier, bottom right across from the controls hint
+        quality_text = self.text.render(self.small_font, f"Quality: {self.quality['name']}", (150, 150, 150))
+        rects.append(screen.blit(quality_text, (WIDTH - 10 - quality_text.get_width(), HEIGHT - 25)))
+        return rects
+
+    def draw_messages(self, game):
+        screen = self.screen
+        rects = []
+
+        # Messages with enhanced styling
+        if game.collapse_message:
+            rects.append(screen.blit(self.sprites.rect(400, 40, BLACK, 150), (WIDTH // 2 - 200, 35)))
+
+            msg_text = self.text.render(self.font, game.collapse_message, WHITE)
+            screen.blit(msg_text, (WIDTH // 2 - msg_text.get_width() // 2, 45))
+
+        if game.powerup_message and game.time - game.powerup_msg_time < MESSAGE_FRAMES:
+            rects.append(screen.blit(self.sprites.rect(300, 30, YELLOW, 100), (WIDTH // 2 - 150, HEIGHT - 50)))
+
+            pu_text = self.text.render(self.font, game.powerup_message, BLACK)
+            rects.append(screen.blit(pu_text, (WIDTH // 2 - pu_text.get_width() // 2, HEIGHT - 45)))
+        return rects
+
+    def draw_profiler(self, profiler):
+        """p50/p99 table of the profiled phases, rebuilt every few frames"""
+        if profiler.frames - self._overlay_frame >= PROFILE_REFRESH_FRAMES:
+            self._overlay_frame = profiler.frames
+            rows = profiler.summary()
+            line_height = self.small_font.get_linesize()
+            size = (250, (len(rows) + 1) * line_height + 10)
+            panel = self._overlay
+            # The same panel is refilled unless the row count changes
+            if panel is None or panel.get_size() != size:
+                panel = pygame.Surface(size, pygame.SRCALPHA)
+                self._overlay_allocations += 1
+            panel.fill((0, 0, 0, 180))
+            lines = [("phase", "p50 ms", "p99 ms")]
+            lines += [(name, f"{p50:.2f}", f"{p99:.2f}") for name, p50, p99 in rows]
+            for i, (name, p50, p99) in enumerate(lines):
+                color = YELLOW if i == 0 or i == len(lines) - 1 else WHITE
+                y = 5 + i * line_height
+                panel.blit(self.text.render(self.small_font, name, color), (5, y))
+                # Right-align the numbers, the font isn't monospaced
+                for text, right in ((p50, 180), (p99, 245)):
+                    surf = self.text.render(self.small_font, text, color)
+                    panel.blit(surf, (right - surf.get_width(), y))
+            self._overlay = panel
+        return self.screen.blit(self._overlay, (10, 90))
+
+    def draw(self, game, alpha=1.0, frame_scale=1.0):
+        """Draw one frame of game; call present() afterwards to show it.
+
+        alpha blends ball and paddle positions between the last two ticks,
+        frame_scale is the frame's length in 60 FPS frames and paces effects.
+        """
+        screen = self.screen
+        static = self.static
+        profiler = self.profiler
+        lap = profiler.lap if profiler is not None else skip_lap
+
+        # Restore whatever was drawn last frame
+        full = self._full_redraw
+        if full:
+            screen.blit(static, (0, 0))
+        else:
+            for rect in self._prev_rects:
+                screen.blit(static, rect, rect)
+        lap("background")
+
+        rects = []
+        compositor = self.compositor
+
+        # Effects layer: background particles, trails and explosion particles
+        # are queued as splats and composited in one pass, under the paddles
+        # and balls. Background particles are scattered, so each keeps its
+        # own dirty rect; the rest get one per trail or pool.
+        self.background_particles.update(scale=frame_scale)
+        self.refill_background_particles()
+        rects.extend(compositor.add(*self.background_particles.splats(), merge=False))
+        lap("background_particles")
+
+        center_x, center_y, player_y, opponent_y = game.render_positions(alpha)
+        center_x, center_y = center_x.tolist(), center_y.tolist()
+        ball_state = game.ball_state
+        branches = game.balls.on_screen()
+
+        # Trails follow the balls on screen
+        if ball_state == "superposition":
+            colors = (NEON_CYAN, NEON_PINK)
+        else:
+            colors = (BLUE, RED)
+        for i in branches:
+            trail = self.trails[i]
+            trail.add_position(center_x[i], center_y[i])
+            splats = trail.splats()
+            if splats is not None:
+                xs, ys, radii, alphas = splats
+                rects.extend(compositor.add(xs, ys, radii, colors[i % 2], alphas))
+        lap("trails")
+
+        # Explosion particles (pool capacity bounds the count), then the one pass
+        self.particles.update(scale=frame_scale)
+        rects.extend(compositor.add(*self.particles.splats()))
+        compositor.composite(screen)
+        lap("particles")
+
+        # Draw enhanced paddles
+        rects.append(self.draw_enhanced_paddle(game.player, player_y, True))
+        rects.append(self.draw_enhanced_paddle(game.opponent, opponent_y, False))
+        lap("paddles")
+
+        # Draw quantum balls
+        for i in branches:
+            rects.append(self.draw_quantum_ball((center_x[i], center_y[i]), ball_state, i))
+        lap("balls")
+
+        # Draw power-ups with enhanced effects
+        for pu in game.powerups:
+            # Glow effect for power-ups
+            rects.append(screen.blit(self.sprites.rect(POWERUP_SIZE, POWERUP_SIZE, WHITE, 30),
+                                     (pu.rect.x, pu.rect.y)))
+
+            surf, text = self.powerup_sprite(pu.gate)
+            screen.blit(surf, (pu.rect.x, pu.rect.y))
+            screen.blit(text, (pu.rect.x + 16, pu.rect.y + 14))
+        lap("powerup_draw")
+
+        # Draw white flash effect on collapse
+        flashing = self.flash_opacity > 0
+        if flashing:
+            self.flash_surface.fill((255, 255, 255, int(self.flash_opacity)))
+            screen.blit(self.flash_surface, (0, 0))
+            self.flash_opacity = max(0, self.flash_opacity - 10 * frame_scale)
+        lap("flash")
+
+        # Enhanced HUD
+        rects.extend(self.draw_hud(game))
+        lap("hud")
+        rects.extend(self.draw_messages(game))
+        lap("messages")
+
+        if profiler is not None and profiler.visible:
+            rects.append(self.draw_profiler(profiler))
+            lap("overlay")
+
+        rects = [rect.clip(SCREEN_RECT) for rect in rects]
+        full = full or flashing or len(rects) > MAX_DIRTY_RECTS
+        self._update_rects = None if full else self._prev_rects + rects
+        self._prev_rects = rects
+        # A flash leaves its tint everywhere, so the next frame restores it all
+        self._full_redraw = flashing or len(rects) > MAX_DIRTY_RECTS
+
+    def present(self):
+        """Push the frame drawn by draw() to the display"""
+        if self._update_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._update_rects)
@@ -0,0 +1,190 @@
+"""Deterministic replays: record a match's inputs, re-simulate it headless.
+
+A replay file is the seed, tick rate, ball branch count and opponent AI
+level of a GameState plus the input bits passed to every step(), stored as (input, run length)
+byte pairs since keys are held for many ticks at a time. The file ends with a digest of the
+final state, which playback compares against to prove the match was
+reproduced exactly.
+
+    python -m quantum_pong.replay match.qpr [--repeat N]
+"""
+import hashlib
+import struct
+import sys
+import time
+
+from .ai import AI_LEVELS
+from .constants import BRANCHES, AI_LEVEL
+from .simulation import GameState
+
+MAGIC = b"QPRP"
+# Bumped whenever the rules change, so no old recording plays on and
+# diverges. Version 1 predates the qubit register and H interference.
+VERSION = 3
+
+# magic, version, tick rate, seed, tick count, ball branches, AI level
+HEADER = struct.Struct("<4sBHQIBB")
+# Version 2 had no AI level byte; those matches were against the classic AI
+HEADER_V2 = struct.Struct("<4sBHQIB")
+
+# AI levels by their header code
+AI_LEVEL_CODES = ("classic",) + tuple(AI_LEVELS)
+DIGEST_SIZE = 16
+
+# Longest run one (input, count) pair can hold
+MAX_RUN = 255
+
+
+def state_digest(game):
+    """Hash of everything that decides how a match continues"""
+    fields = (
+        game.frame, game.player_score, game.opponent_score, game.ball_state, game.phase,
+        game.balls.x.tobytes(), game.balls.y.tobytes(), game.balls.dx.tobytes(),
+        game.balls.dy.tobytes(), game.balls.visible.tobytes(), game.player.y, game.opponent.y,
+        game.measurement_timer, game.z_noise_timer, game.powerup_timer,
+        game.powerups_spawned, tuple((pu.gate, pu.rect.x, pu.rect.y) for pu in game.powerups),
+        game.qubit.state.tobytes(),
+    )
+    return hashlib.blake2b(repr(fields).encode(), digest_size=DIGEST_SIZE).digest()
+
+
+class ReplayRecorder:
+    """Collects the inputs of one match as it is played.
+
+    record() is a compare and an increment on most ticks, so it can stay on
+    in every session.
+    """
+
+    def __init__(self, seed, tick_rate, branches=BRANCHES, ai_level=AI_LEVEL):
+        if not (isinstance(seed, int) and 0 <= seed < 2 ** 64):
+            raise ValueError("replays need an integer seed in [0, 2**64)")
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.branches = branches
+        self.ai_level = ai_level
+        self.ticks = 0
+        self._runs = bytearray()
+        self._last = None
+        self._count = 0
+
+    def record(self, inputs):
+        self.ticks += 1
+        if inputs == self._last and self._count < MAX_RUN:
+            self._count += 1
+            return
+        if self._count:
+            self._runs += bytes((self._last, self._count))
+        self._last = inputs
+        self._count = 1
+
+    def to_bytes(self, game):
+        """Serialize the recording, sealed with a digest of game's final state"""
+        runs = self._runs
+        if self._count:
+            runs = runs + bytes((self._last, self._count))
+        header = HEADER.pack(MAGIC, VERSION, self.tick_rate, self.seed, self.ticks, self.branches,
+                             AI_LEVEL_CODES.index(self.ai_level))
+        return header + bytes(runs) + state_digest(game)
+
+    def save(self, path, game):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes(game))
+
+
+class Replay:
+    """A loaded replay file"""
+
+    def __init__(self, seed, tick_rate, ticks, runs, digest, branches=BRANCHES, ai_level=AI_LEVEL):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.branches = branches
+        self.ai_level = ai_level
+        self.ticks = ticks
+        self.runs = runs
+        self.digest = digest
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER_V2.size + DIGEST_SIZE:
+            raise ValueError("replay file is truncated")
+        magic, version, tick_rate, seed, ticks, branches = HEADER_V2.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a Quantum Pong replay")
+        if version == 1:
+            raise ValueError("replay version 1 was recorded under the rules before the qubit "
+                             "register and can't be reproduced")
+        if version == 2:
+            header, ai_level = HEADER_V2, "classic"
+        elif version == VERSION:
+            if len(data) < HEADER.size + DIGEST_SIZE:
+                raise ValueError("replay file is truncated")
+            header, code = HEADER, HEADER.unpack_from(data)[-1]
+            if code >= len(AI_LEVEL_CODES):
+                raise ValueError(f"unknown AI level {code} in replay")
+            ai_level = AI_LEVEL_CODES[code]
+        else:
+            raise ValueError(f"unsupported replay version {version}")
+        body = data[header.size:-DIGEST_SIZE]
+        if len(body) % 2:
+            raise ValueError("replay file is corrupt")
+        runs = list(zip(body[::2], body[1::2]))
+        if sum(count for _, count in runs) != ticks:
+            raise ValueError("replay tick count doesn't match its inputs")
+        return cls(seed, tick_rate, ticks, runs, data[-DIGEST_SIZE:], branches, ai_level)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def inputs(self):
+        """Input bits for every tick, in order"""
+        for inputs, count in self.runs:
+            for _ in range(count):
+                yield inputs
+
+    def play(self):
+        """Re-simulate the match headless and return the final GameState"""
+        game = GameState(seed=self.seed, tick_rate=self.tick_rate, branches=self.branches,
+                         ai_level=self.ai_level)
+        game.interpolate = False
+        step = game.step
+        for inputs, count in self.runs:
+            for _ in range(count):
+                step(inputs)
+        return game
+
+    def verify(self):
+        """Play the replay and check it ends in the recorded state"""
+        game = self.play()
+        return state_digest(game) == self.digest, game
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+    repeat = 1
+    if "--repeat" in args:
+        i = args.index("--repeat")
+        repeat = int(args[i + 1])
+        del args[i:i + 2]
+    if len(args) != 1:
+        print("usage: python -m quantum_pong.replay FILE [--repeat N]")
+        return 2
+
+    replay = Replay.load(args[0])
+    start = time.perf_counter()
+    for _ in range(repeat):
+        ok, game = replay.verify()
+        if not ok:
+            break
+    elapsed = time.perf_counter() - start
+    played = replay.ticks / replay.tick_rate * repeat
+    print(f"{replay.ticks} ticks at {replay.tick_rate} Hz, seed {replay.seed}: "
+          f"score {game.player_score}-{game.opponent_score}")
+    print(f"{'match' if ok else 'MISMATCH'} in {elapsed:.2f}s "
+          f"({played / max(elapsed, 1e-9):.0f}x real time)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,687 @@
+import math
+import random
+
+import numpy as np
+
+from .constants import (
+    WIDTH, HEIGHT, WHITE, BLUE, CYAN, RED, YELLOW, GREEN, PURPLE, NEON_CYAN,
+    BALL_RADIUS, PADDLE_WIDTH, PADDLE_HEIGHT, BASE_SPEED, MAX_SPEED,
+    JERK_SPEED, JERK_DURATION, DELAY_FRAMES, Z_NOISE_INTERVAL, Z_NOISE_CHANCE,
+    GATE_DROP_INTERVAL, MEASUREMENT_TIMEOUT, GATE_TYPES, PLAYER_SPEED,
+    OPPONENT_SPEED, POWERUP_FALL_SPEED, POWERUP_SIZE, TICK_RATE,
+    SCORE_PAUSE_FRAMES, MESSAGE_FRAMES, BRANCHES, MAX_BRANCHES, AI_LEVEL,
+    INPUT_UP, INPUT_DOWN, INPUT_X, INPUT_Z, INPUT_H,
+)
+from .ai import InterceptAI
+from .balls import BallSet
+from .broadphase import SpatialHash
+from .physics import move_ball
+from .profiler import skip_lap
+from .qubits import QubitRegister, EPSILON as QUBIT_EPSILON
+
+# Round phases
+PLAYING = "playing"
+SCORED = "scored"
+
+# Moves longer than this between two ticks are teleports, not motion
+SNAP_DISTANCE = JERK_SPEED * 3
+
+# Power-ups are caught within this many pixels of their box
+POWERUP_REACH = 5
+
+# Falling power-ups at which catches query the grid instead of testing each
+BROADPHASE_MIN_OBJECTS = 8
+
+# Balance constants a GameState can override per game, e.g. for sweeps
+TUNABLE = {
+    "base_speed": BASE_SPEED,
+    "max_speed": MAX_SPEED,
+    "jerk_speed": JERK_SPEED,
+    "jerk_duration": JERK_DURATION,
+    "z_noise_interval": Z_NOISE_INTERVAL,
+    "gate_drop_interval": GATE_DROP_INTERVAL,
+    "measurement_timeout": MEASUREMENT_TIMEOUT,
+    "delay_frames": DELAY_FRAMES,
+    "branches": BRANCHES,
+    "ai_level": AI_LEVEL,
+}
+
+
+class StreamRandom(random.Random):
+    """random.Random that knows how far into its stream it is.
+
+    Mersenne Twister draws 32-bit words, and its state is fixed by the seed
+    and the number of words drawn since. Counting them makes the state one
+    integer, `position`, that a snapshot can hold and seek() can return to.
+    The draws are exactly those of random.Random.
+    """
+
+    def seed(self, a=None, version=2):
+        super().seed(a, version)
+        self.key = a
+        self.position = 0
+
+    def random(self):
+        self.position += 2
+        return super().random()
+
+    def getrandbits(self, k):
+        self.position += (k + 31) // 32
+        return super().getrandbits(k)
+
+    def seek(self, position):
+        """Move to `position` words into the stream, backwards or forwards"""
+        if position < self.position:
+            super().seed(self.key)
+            self.position = 0
+        skip = position - self.position
+        if skip:
+            super().getrandbits(32 * skip)
+        self.position = position
+
+
+class Box:
+    """Float rectangle with the subset of pygame.Rect the game logic uses"""
+    __slots__ = ("x", "y", "w", "h")
+
+    def __init__(self, x, y, w, h):
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def right(self):
+        return self.x + self.w
+
+    @property
+    def top(self):
+        return self.y
+
+    @property
+    def bottom(self):
+        return self.y + self.h
+
+    @property
+    def centerx(self):
+        return self.x + self.w // 2
+
+    @property
+    def centery(self):
+        return self.y + self.h // 2
+
+    @property
+    def center(self):
+        return (self.x + self.w // 2, self.y + self.h // 2)
+
+    @property
+    def topleft(self):
+        return (self.x, self.y)
+
+    @topleft.setter
+    def topleft(self, pos):
+        self.x, self.y = pos
+
+    def move_ip(self, dx, dy):
+        self.x += dx
+        self.y += dy
+
+    def colliderect(self, other):
+        return (self.x < other.x + other.w and other.x < self.x + self.w and
+                self.y < other.y + other.h and other.y < self.y + self.h)
+
+    def file_in(self, grid, obj=None):
+        """Add or re-file this box (or obj, whose box this is) in a SpatialHash"""
+        x, y = self.x, self.y
+        grid.move(self if obj is None else obj, x, y, x + self.w, y + self.h)
+
+    def inflated_collide(self, other, amount):
+        # colliderect(other.inflate(amount, amount)) without building a new rect
+        half = amount // 2
+        return (self.x < other.x + other.w + half and other.x - half < self.x + self.w and
+                self.y < other.y + other.h + half and other.y - half < self.y + self.h)
+
+
+class FallingGate:
+    """Gameplay side of a power-up: position and gate type only"""
+    __slots__ = ("gate", "rect", "glow_timer", "original_y", "alive", "serial")
+
+    def __init__(self, gate_type, x, serial=0):
+        self.gate = gate_type
+        self.serial = serial
+        self.rect = Box(x - POWERUP_SIZE // 2, -20 - POWERUP_SIZE // 2, POWERUP_SIZE, POWERUP_SIZE)
+        self.glow_timer = 0
+        self.original_y = self.rect.y
+        self.alive = True
+
+    def update(self, scale=1.0, grid=None):
+        self.glow_timer += 0.2 * scale
+
+        # Floating effect
+        self.rect.y = self.original_y + int(math.sin(self.glow_timer) * 3)
+        self.original_y += POWERUP_FALL_SPEED * scale
+
+        if self.rect.top > HEIGHT:
+            self.kill(grid)
+        elif grid is not None:
+            self.rect.file_in(grid, self)
+
+    def kill(self, grid=None):
+        self.alive = False
+        if grid is not None:
+            grid.remove(self)
+
+
+class GameState:
+    """All gameplay state plus a display-free step(inputs).
+
+    step() never touches pygame. Anything the front-end needs to show
+    (explosions, flashes, prints, trail resets) is reported through
+    self.events as (kind, ...) tuples, cleared at the start of every step.
+
+    Each step is one tick of 1 / tick_rate seconds. Speeds and timers keep
+    their 60 FPS units and are scaled by `scale`, so the game plays the same
+    at any tick rate; `time` counts elapsed 60 FPS frames. Keyword
+    arguments override the balance constants listed in TUNABLE.
+
+    The ball is a register of qubits with one branch per basis state, kept
+    in self.balls. In superposition every branch with amplitude is in
+    play; once measured, branch self.branch is the only ball.
+    """
+
+    def __init__(self, seed=None, tick_rate=TICK_RATE, **tuning):
+        unknown = set(tuning) - set(TUNABLE)
+        if unknown:
+            raise TypeError(f"unknown tuning parameter(s): {', '.join(sorted(unknown))}")
+        for name, default in TUNABLE.items():
+            setattr(self, name, tuning.get(name, default))
+
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        # One stream per gameplay subsystem, so adding a draw in one place
+        # doesn't shift every other random outcome in a replay
+        self.serve_rng = StreamRandom(f"{seed}:serve")
+        self.powerup_rng = StreamRandom(f"{seed}:powerup")
+        self.measure_rng = StreamRandom(f"{seed}:measure")
+        self.noise_rng = StreamRandom(f"{seed}:noise")
+        self.tick_rate = tick_rate
+        self.scale = 60 / tick_rate
+        self.frame = 0
+        self.time = 0.0
+        self.events = []
+        self.phase = PLAYING
+        self.pause_timer = 0
+        # Set to a FrameProfiler's lap to time the phases of each step
+        self.lap = skip_lap
+        # Runs that never draw (replay playback) can skip keeping the
+        # previous tick's positions for render_positions()
+        self.interpolate = True
+
+        self.player = Box(20, HEIGHT // 2 - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.opponent = Box(WIDTH - 30, HEIGHT // 2 - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.paddles = (self.player, self.opponent)
+        if self.ai_level == "classic":
+            self.opponent_ai = None
+        else:
+            self.opponent_ai = InterceptAI(self.opponent, self.ai_level)
+
+        # Broadphase over power-ups. The two paddles are tested directly:
+        # hashing them cost more than the tests it saved
+        self.grid = SpatialHash()
+
+        self.player_score = 0
+        self.opponent_score = 0
+
+        # Power-ups
+        self.powerups = []
+        self.powerups_spawned = 0
+        self.powerup_timer = 0
+        self.powerup_message = ""
+        self.powerup_msg_time = -MESSAGE_FRAMES
+
+        self.set_branches(self.branches)
+
+    def set_branches(self, count):
+        """Play with `count` ball branches (a power of two) and serve again"""
+        if not (2 <= count <= MAX_BRANCHES and count & (count - 1) == 0):
+            raise ValueError(f"branches must be a power of two from 2 to {MAX_BRANCHES}, not {count}")
+        self.branches = count
+        # The ball's quantum state; ball_state and state_label are read from it
+        self.qubit = QubitRegister(count.bit_length() - 1)
+        self.balls = BallSet(count)
+        self.reset_round()
+        self.store_previous_positions()
+
+    # Event helpers ---------------------------------------------------------
+
+    def explosion(self, x, y, color=NEON_CYAN, count=8):
+        self.events.append(("explosion", x, y, color, count))
+
+    def set_powerup_message(self, message):
+        self.powerup_message = message
+        self.powerup_msg_time = self.time
+
+    def clear_trails(self, keep=None):
+        for i in range(self.branches):
+            if i != keep:
+                self.events.append(("clear_trail", i))
+
+    # Interpolation ---------------------------------------------------------
+
+    def store_previous_positions(self):
+        self._previous = (self.balls.x.copy(), self.balls.y.copy(), self.player.y, self.opponent.y)
+
+    def render_positions(self, alpha):
+        """Ball centers and paddle tops blended between the last two ticks.
+
+        alpha is how far the display time is past the previous tick (0-1).
+        Returns (center_x, center_y, player_y, opponent_y), where the centers
+        are arrays with one entry per branch.
+        """
+        def lerp(old, new):
+            if abs(new - old) > SNAP_DISTANCE:
+                return new
+            return old + (new - old) * alpha
+
+        def lerp_array(old, new):
+            return np.where(np.abs(new - old) > SNAP_DISTANCE, new, old + (new - old) * alpha)
+
+        x, y, player_y, opponent_y = self._previous
+        half = BALL_RADIUS
+        return (
+            lerp_array(x, self.balls.x) + half,
+            lerp_array(y, self.balls.y) + half,
+            lerp(player_y, self.player.y),
+            lerp(opponent_y, self.opponent.y),
+        )
+
+    # Quantum state ---------------------------------------------------------
+
+    @property
+    def active_branch(self):
+        """The measured ball, or in superposition the first branch on screen"""
+        if self.branch is not None:
+            return self.branch
+        visible = self.balls.on_screen()
+        return visible[0] if visible else 0
+
+    def sync_branches(self):
+        """Mark the branches that have amplitude; returns how many there are"""
+        alive = self.balls.alive
+        alive[:] = self.qubit.probabilities() > QUBIT_EPSILON
+        return int(alive.sum())
+
+    def set_classical(self, index):
+        self.branch = index
+        self.ball_state = format(index, f"0{self.qubit.n}b")
+        self.state_label = self.qubit.label()
+        self.balls.show([index])
+
+    def set_superposed(self):
+        self.branch = None
+        self.ball_state = "superposition"
+        self.state_label = self.qubit.label()
+
+    # Gameplay --------------------------------------------------------------
+
+    def reset_round(self):
+        # Serve in |++...+> = H|00...0>, every branch in play
+        self.qubit.reset()
+        self.qubit.apply_all("H")
+        self.sync_branches()
+        self.set_superposed()
+
+        angle = self.serve_rng.uniform(-0.6, 0.6)
+        self.ball_speed = self.base_speed
+        dx = self.ball_speed * self.serve_rng.choice([-1, 1])
+        self.balls.serve(dx, self.ball_speed * math.sin(angle))
+
+        self.revealed = False
+        self.delay_counter = 0
+        self.measurement_timer = 0
+        self.collapse_message = ""
+        self.has_collapsed = False
+        self.z_noise_timer = 0
+        self.jerk_timer = 0
+        for pu in self.powerups:
+            pu.kill(self.grid)
+        self.powerups.clear()
+
+        # Clear trails
+        self.clear_trails()
+
+    def apply_hadamard(self, source="manual"):
+        balls = self.balls
+        origin = self.active_branch
+        self.qubit.apply_all("H")
+        if self.sync_branches() == 1:
+            # H|+> = |0> and H|-> = |1>: interference, not a measurement
+            self.interfere(int(np.argmax(balls.alive)), source)
+            return
+
+        self.set_superposed()
+        balls.split(origin)
+        balls.show_alive()
+        self.revealed = True
+        self.delay_counter = self.delay_frames
+        self.measurement_timer = 0
+        self.has_collapsed = False
+
+        # Clear trails when transitioning to superposition
+        self.clear_trails()
+
+        # Visual effects
+        x, y = balls.position(0)
+        self.explosion(x, y, GREEN, 20)
+
+        self.events.append(("gate", "H", source,
+                            f"{len(balls.on_screen())} branches from {(round(x), round(y))}"))
+
+    def interfere(self, index, source):
+        """Leave superposition for branch `index` because a gate cancelled the others"""
+        balls = self.balls
+        # A branch still waiting for the serve delay takes over from the one on screen
+        if not balls.visible[index]:
+            balls.copy(self.active_branch, index)
+        self.set_classical(index)
+        self.clear_trails(keep=index)
+        self.has_collapsed = True
+        self.collapse_message = f"Interference: H gave |{self.ball_state}>"
+        x, y = balls.position(index)
+        self.explosion(x + BALL_RADIUS, y + BALL_RADIUS, GREEN, 20)
+        self.events.append(("gate", "H", source, f"interfered to state {self.ball_state}"))
+
+    def apply_x(self, source="manual"):
+        balls = self.balls
+        old = self.branch
+        self.qubit.apply_all("X")
+        self.sync_branches()
+        new = int(np.argmax(balls.alive))
+        # The ball carries on from where it was as the flipped branch
+        balls.copy(old, new)
+        self.set_classical(new)
+        # Clear the old trail and start fresh for the new state
+        self.events.append(("clear_trail", old))
+        self.events.append(("clear_trail", new))
+        x, y = balls.position(new)
+        self.explosion(x + BALL_RADIUS, y + BALL_RADIUS, RED, 15)
+        balls.dx[new] *= -1  # Flip direction on state change
+        self.jerk_timer = self.jerk_duration  # Apply speed jerk
+        self.events.append(("gate", "X", source, f"switched to state {self.ball_state}"))
+
+    def apply_z(self, source="manual"):
+        # The relative phase shows as the ball's vertical direction: every
+        # branch whose amplitude changes sign turns around
+        before = self.qubit.state.copy()
+        self.qubit.apply_all("Z")
+        flipped = (self.qubit.state * before.conj()).real < 0
+        self.balls.dy[flipped] *= -1
+        self.state_label = self.qubit.label()
+        self.events.append(("gate", "Z", source, "phase flipped"))
+
+    def nearby_paddles(self, x, dx):
+        """Paddles within reach of a ball's path along x for this tick"""
+        travel_x = dx * self.scale
+        if travel_x < 0:
+            left, right = x + travel_x, x + BALL_RADIUS * 2
+        else:
+            left, right = x, x + BALL_RADIUS * 2 + travel_x
+        player, opponent = self.paddles
+        if left <= player.x + player.w and player.x <= right:
+            return (player, opponent) if left <= opponent.x + opponent.w and opponent.x <= right else (player,)
+        return (opponent,) if left <= opponent.x + opponent.w and opponent.x <= right else ()
+
+    def check_powerup_collision(self, x, y):
+        """Catch any power-up within reach of the ball box at (x, y)"""
+        size = BALL_RADIUS * 2
+        if len(self.powerups) < BROADPHASE_MIN_OBJECTS:
+            # Already in spawn order
+            candidates = self.powerups
+        else:
+            candidates = list(self.grid.query(x - POWERUP_REACH, y - POWERUP_REACH,
+                                              x + size + POWERUP_REACH, y + size + POWERUP_REACH))
+            # Spawn order keeps overlapping catches deterministic
+            candidates.sort(key=lambda pu: pu.serial)
+        if not candidates:
+            return
+        ball_rect = Box(x, y, size, size)
+        caught = False
+        for pu in candidates:
+            if not pu.alive:
+                continue
+            if ball_rect.inflated_collide(pu.rect, POWERUP_REACH * 2):
+                caught = True
+                self.explosion(pu.rect.centerx, pu.rect.centery, YELLOW, 10)
+                if pu.gate == 'X' and self.branch is not None:
+                    self.apply_x(source="powerup")
+                    self.powerup_message = "X-gate applied (Power-Up)"
+                elif pu.gate == 'Z' and self.branch is None:
+                    self.apply_z(source="powerup")
+                    self.powerup_message = "Z-gate applied (Power-Up)"
+                elif pu.gate == 'H':
+                    self.apply_hadamard(source="powerup")
+                    self.powerup_message = "H-gate applied (Power-Up)"
+                pu.kill(self.grid)
+                self.powerup_msg_time = self.time
+        if caught:
+            self.powerups = [pu for pu in self.powerups if pu.alive]
+
+    def collapse(self, index, cause):
+        """Measure the superposed ball into branch `index` (cause: 'paddle' or 'timeout')"""
+        self.qubit.project_basis(index)
+        self.sync_branches()
+        self.set_classical(index)
+        if cause == "timeout":
+            self.collapse_message = f"Auto-measured: collapsed to |{self.ball_state}>"
+        else:
+            self.collapse_message = f"Measured: collapsed to |{self.ball_state}>"
+        self.has_collapsed = True
+        self.jerk_timer = self.jerk_duration
+        self.events.append(("collapse", self.ball_state, cause))
+        # Only the measured branch's trail carries on
+        self.clear_trails(keep=index)
+        x, y = self.balls.position(index)
+        if cause == "timeout":
+            color, count = PURPLE, 20
+        else:
+            color, count = (BLUE if index % 2 == 0 else RED), 25
+        self.explosion(x + BALL_RADIUS, y + BALL_RADIUS, color, count)
+
+    def move_branches(self, wall_color, hit_color):
+        """Move every branch on screen through one tick, in one pass.
+
+        Returns the first branch, by index, that hit a paddle, or None.
+        """
+        balls = self.balls
+        scale = self.scale
+        x_array, y_array, dx_array, dy_array = balls.x, balls.y, balls.dx, balls.dy
+        xs, ys = x_array.tolist(), y_array.tolist()
+        dxs, dys = dx_array.tolist(), dy_array.tolist()
+        first_hit = None
+        for i in balls.on_screen():
+            x, y, dx, dy = xs[i], ys[i], dxs[i], dys[i]
+            x_array[i], y_array[i], dx_array[i], dy_array[i], wall, hit = move_ball(
+                x, y, dx, dy, scale, self.nearby_paddles(x, dx))
+            if wall:
+                self.explosion(*wall, wall_color, 8)
+            if hit:
+                self.explosion(*hit, hit_color, 12)
+                if first_hit is None:
+                    first_hit = i
+        return first_hit
+
+    def catch_powerups(self):
+        """Let every branch on screen catch power-ups; False if a gate changed the state"""
+        balls = self.balls
+        state = self.ball_state
+        for i in balls.on_screen():
+            self.check_powerup_collision(*balls.position(i))
+            if self.ball_state != state:
+                return False
+        return True
+
+    def steer(self, paddle, inputs):
+        """Move a paddle through one tick by the UP/DOWN bits of `inputs`"""
+        if inputs & INPUT_UP and paddle.y > 0:
+            paddle.y -= PLAYER_SPEED * self.scale
+        if inputs & INPUT_DOWN and paddle.y + paddle.h < HEIGHT:
+            paddle.y += PLAYER_SPEED * self.scale
+
+    def step(self, inputs=0, opponent_inputs=None):
+        """Advance the game by one tick and return this tick's events.
+
+        opponent_inputs drives the right paddle the way `inputs` drives the
+        left one, e.g. for a player across the network; with None the
+        built-in AI plays it. Either side's gate bits apply the gate, once.
+        """
+        self.events = []
+        self.frame += 1
+        scale = self.scale
+        self.time += scale
+        if self.interpolate:
+            self.store_previous_positions()
+        player, opponent = self.player, self.opponent
+
+        if self.phase == SCORED:
+            # Hold the scored ball on screen, then serve the next round
+            self.pause_timer -= scale
+            if self.pause_timer <= 0:
+                self.phase = PLAYING
+                self.reset_round()
+            return self.events
+
+        # Player input
+        self.steer(player, inputs)
+        gates = inputs if opponent_inputs is None else inputs | opponent_inputs
+        if gates & INPUT_X and self.branch is not None:
+            self.apply_x(source="manual")
+            self.set_powerup_message("X-gate manually applied")
+        if gates & INPUT_Z and self.branch is None:
+            self.apply_z(source="manual")
+            self.set_powerup_message("Z-gate manually applied")
+        if gates & INPUT_H:
+            self.apply_hadamard(source="manual")
+            self.set_powerup_message("H-gate manually applied")
+
+        if opponent_inputs is not None:
+            self.steer(opponent, opponent_inputs)
+        elif self.opponent_ai is not None:
+            # Opponent AI heads for where it expects the ball to arrive
+            offset = self.opponent_ai.target(self) - opponent.centery
+            travel = min(abs(offset), self.opponent_ai.speed * scale)
+            y = min(max(opponent.y + math.copysign(travel, offset), 0), HEIGHT - opponent.h)
+            opponent.y = y
+        else:
+            # Classic opponent AI tracks the active ball
+            ball_y = self.balls.centery(self.active_branch)
+            if opponent.centery < ball_y and opponent.bottom < HEIGHT:
+                opponent.y += OPPONENT_SPEED * scale
+            elif opponent.centery > ball_y and opponent.y > 0:
+                opponent.y -= OPPONENT_SPEED * scale
+        self.lap("ai")
+
+        # Spawn and update powerups
+        self.powerup_timer += scale
+        if self.powerup_timer > self.gate_drop_interval:
+            gate = self.powerup_rng.choice(GATE_TYPES)
+            self.powerups_spawned += 1
+            pu = FallingGate(gate, self.powerup_rng.randint(100, WIDTH - 100), self.powerups_spawned)
+            pu.rect.file_in(self.grid, pu)
+            self.powerups.append(pu)
+            self.powerup_timer = 0
+        if self.powerups:
+            for pu in self.powerups:
+                pu.update(scale, self.grid)
+            if not all(pu.alive for pu in self.powerups):
+                self.powerups = [pu for pu in self.powerups if pu.alive]
+        self.lap("powerup_update")
+
+        if self.branch is None:
+            self._step_superposition()
+        else:
+            self._step_classical()
+        self.lap("physics")
+        return self.events
+
+    def _step_superposition(self):
+        scale = self.scale
+        hit = self.move_branches(CYAN, WHITE)
+
+        if not self.revealed:
+            # The other branches appear a moment after the serve
+            self.delay_counter += scale
+            if self.delay_counter > self.delay_frames:
+                self.balls.show_alive()
+                self.revealed = True
+
+        if self.powerups and not self.catch_powerups():
+            # An H power-up interfered the ball out of superposition
+            return
+
+        self.measurement_timer += scale
+        if hit is not None:
+            self.events.append(("paddle_hit", hit))
+            self.collapse(hit, "paddle")
+        elif self.measurement_timer > self.measurement_timeout:
+            # Born rule: |amplitude|^2 decides the outcome
+            self.collapse(self.qubit.measure_all(self.measure_rng), "timeout")
+
+    def _step_classical(self):
+        balls = self.balls
+        scale = self.scale
+        hit = self.move_branches(WHITE, YELLOW)
+
+        if self.powerups:
+            self.catch_powerups()
+            if self.branch is None:
+                # H power-up put the ball back into superposition
+                return
+
+        i = self.branch
+        if hit is not None:
+            self.events.append(("paddle_hit", i))
+
+        if self.jerk_timer > 0:
+            current_speed = self.jerk_speed
+            self.jerk_timer -= scale
+        else:
+            current_speed = self.base_speed
+        self.ball_speed = max(self.base_speed, min(self.ball_speed, self.max_speed))
+
+        # Normalize dx, dy with current speed
+        angle = math.atan2(balls.dy.item(i), balls.dx.item(i))
+        balls.dx[i] = current_speed * math.cos(angle)
+        balls.dy[i] = current_speed * math.sin(angle)
+
+        x, y = balls.position(i)
+        self.z_noise_timer += scale
+        if self.z_noise_timer > self.z_noise_interval:
+            if self.noise_rng.random() < Z_NOISE_CHANCE:
+                balls.dy[i] *= -1
+                self.collapse_message = "Z-noise: vertical flip!"
+                self.events.append(("z_noise",))
+                self.explosion(x + BALL_RADIUS, y + BALL_RADIUS, PURPLE, 15)
+            self.z_noise_timer = 0
+
+        if x + BALL_RADIUS * 2 >= WIDTH:
+            self.player_score += 1
+            self.collapse_message = "You scored!"
+            self.explosion(WIDTH - 50, y + BALL_RADIUS, GREEN, 30)
+            self.events.append(("score", "player"))
+            self.start_score_pause()
+        elif x <= 0:
+            self.opponent_score += 1
+            self.collapse_message = "You missed!"
+            self.explosion(50, y + BALL_RADIUS, RED, 30)
+            self.events.append(("score", "opponent"))
+            self.start_score_pause()
+
+    def start_score_pause(self):
+        # Non-blocking replacement for the old pygame.time.wait(1000)
+        self.phase = SCORED
+        self.pause_timer = SCORE_PAUSE_FRAMES
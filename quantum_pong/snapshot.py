@@ -0,0 +1,235 @@
+"""Fixed-layout snapshots of gameplay state, for rollback and rewinding.
+
+Everything that decides how a GameState plays on is packed into one
+float64 row: timers, scores, paddles, every ball branch, the qubit
+amplitudes, the power-ups, the messages and the position of each random
+stream. Capturing and restoring copy a handful of slices instead of
+deep-copying Python objects, so a StateRing can keep every one of the
+last ROLLBACK_TICKS ticks for rollback netcode, instant rewind or
+"what-if" runs from any recent tick.
+
+Text (messages and the state label) is stored as ids into the layout's
+table of strings seen so far, and the random streams as word counts (see
+simulation.StreamRandom), which is what keeps the layout fixed.
+"""
+from operator import attrgetter
+
+import numpy as np
+
+from .constants import GATE_TYPES, ROLLBACK_TICKS
+from .simulation import FallingGate, PLAYING, SCORED
+
+# Power-ups a row has room for; only a handful are ever on screen
+MAX_POWERUPS = 16
+
+# Plain numeric GameState attributes. Timers start as ints and turn into
+# floats, as do the paddles' ys once moved at a fractional speed, so the
+# header also holds a mask of which of these and the paddle ys were ints,
+# and restoring gives back the exact values (and state_digest()s) captured.
+SCALARS = (
+    "frame", "time", "pause_timer", "player_score", "opponent_score",
+    "powerups_spawned", "powerup_timer", "powerup_msg_time", "ball_speed",
+    "measurement_timer", "delay_counter", "z_noise_timer", "jerk_timer",
+    "revealed", "has_collapsed",
+)
+FLAGS = ("revealed", "has_collapsed")
+
+# The rest of the header: the int mask and fields that need converting,
+# then the stream positions
+EXTRAS = ("int_mask", "phase", "branch", "player_y", "opponent_y",
+          "collapse_message", "powerup_message", "state_label", "powerup_count")
+RNGS = ("serve_rng", "powerup_rng", "measure_rng", "noise_rng")
+
+# Per power-up: gate, serial, x, y, original_y, glow_timer
+POWERUP_FIELDS = 6
+
+# Random stream states kept per stream, so restoring seldom has to reseed
+RNG_STATES = 64
+
+
+class StateLayout:
+    """Where each part of a GameState with `branches` ball branches sits in a row"""
+
+    def __init__(self, branches):
+        self.branches = branches
+        self.header = len(SCALARS) + len(EXTRAS) + len(RNGS)
+        self._balls = slice(self.header, self.header + 6 * branches)
+        self._qubit = slice(self._balls.stop, self._balls.stop + 2 * branches)
+        self._powerups = slice(self._qubit.stop, self._qubit.stop + MAX_POWERUPS * POWERUP_FIELDS)
+        self.width = self._powerups.stop
+
+        self._scalars = attrgetter(*SCALARS)
+        self._rngs = attrgetter(*RNGS)
+        # Full states of each random stream by position, taken whenever a
+        # capture finds it has moved; setstate() is much faster than seek()
+        self._rng_states = [{} for _ in RNGS]
+        # Strings seen so far; rows hold their index
+        self.texts = []
+        self._text_ids = {}
+
+    def _text_id(self, text):
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = self._text_ids[text] = len(self.texts)
+            self.texts.append(text)
+        return text_id
+
+    def capture(self, game, row=None):
+        """Write game's state into `row` (a new one if None) and return it"""
+        if game.branches != self.branches:
+            raise ValueError(f"layout is for {self.branches} branches, not {game.branches}")
+        powerups = game.powerups
+        if len(powerups) > MAX_POWERUPS:
+            raise ValueError(f"more than {MAX_POWERUPS} power-ups to capture")
+        if row is None:
+            row = np.zeros(self.width)
+
+        scalars = self._scalars(game)
+        player_y, opponent_y = game.player.y, game.opponent.y
+        int_mask = 0
+        for i, value in enumerate(scalars + (player_y, opponent_y)):
+            if value.__class__ is int:
+                int_mask |= 1 << i
+        row[:self.header] = scalars + (
+            int_mask, game.phase == SCORED, -1 if game.branch is None else game.branch,
+            player_y, opponent_y,
+            self._text_id(game.collapse_message), self._text_id(game.powerup_message),
+            self._text_id(game.state_label), len(powerups),
+        ) + tuple(rng.position for rng in self._rngs(game))
+        for rng, states in zip(self._rngs(game), self._rng_states):
+            if rng.position not in states:
+                states[rng.position] = rng.getstate()
+                if len(states) > RNG_STATES:
+                    del states[next(iter(states))]
+
+        balls = game.balls
+        ball_rows = row[self._balls].reshape(6, self.branches)
+        ball_rows[0] = balls.x
+        ball_rows[1] = balls.y
+        ball_rows[2] = balls.dx
+        ball_rows[3] = balls.dy
+        ball_rows[4] = balls.alive
+        ball_rows[5] = balls.visible
+        row[self._qubit] = game.qubit.state.view(np.float64)
+
+        slots = row[self._powerups].reshape(MAX_POWERUPS, POWERUP_FIELDS)
+        for slot, pu in zip(slots, powerups):
+            slot[:] = (GATE_TYPES.index(pu.gate), pu.serial, pu.rect.x, pu.rect.y,
+                       pu.original_y, pu.glow_timer)
+        return row
+
+    def restore(self, game, row):
+        """Put game back in the state captured in `row`.
+
+        game must have the seed, tuning and branch count of the game the row
+        was captured from.
+        """
+        if game.branches != self.branches:
+            raise ValueError(f"layout is for {self.branches} branches, not {game.branches}")
+        values = row[:self.header].tolist()
+        extras = values[len(SCALARS):len(SCALARS) + len(EXTRAS)]
+        int_mask = int(extras[0])
+        for i, (name, value) in enumerate(zip(SCALARS, values)):
+            if name in FLAGS:
+                value = bool(value)
+            elif int_mask >> i & 1:
+                value = int(value)
+            setattr(game, name, value)
+        _, phase, branch, player_y, opponent_y, collapse, message, label, count = extras
+        positions = values[len(SCALARS) + len(EXTRAS):]
+
+        game.phase = SCORED if phase else PLAYING
+        paddle_bit = 1 << len(SCALARS)
+        game.player.y = int(player_y) if int_mask & paddle_bit else player_y
+        game.opponent.y = int(opponent_y) if int_mask & paddle_bit << 1 else opponent_y
+        game.collapse_message = self.texts[int(collapse)]
+        game.powerup_message = self.texts[int(message)]
+        game.state_label = self.texts[int(label)]
+
+        balls = game.balls
+        ball_rows = row[self._balls].reshape(6, self.branches)
+        balls.x[:] = ball_rows[0]
+        balls.y[:] = ball_rows[1]
+        balls.dx[:] = ball_rows[2]
+        balls.dy[:] = ball_rows[3]
+        balls.alive[:] = ball_rows[4] != 0
+        balls.show(np.flatnonzero(ball_rows[5]).tolist())
+        game.qubit.state.view(np.float64)[:] = row[self._qubit]
+        if branch < 0:
+            game.branch = None
+            game.ball_state = "superposition"
+        else:
+            game.branch = int(branch)
+            game.ball_state = format(game.branch, f"0{game.qubit.n}b")
+
+        self._restore_powerups(game, row[self._powerups].reshape(MAX_POWERUPS, POWERUP_FIELDS)[:int(count)])
+        for rng, states, position in zip(self._rngs(game), self._rng_states, positions):
+            if rng.position != position:
+                position = int(position)
+                state = states.get(position)
+                if state is None:
+                    rng.seek(position)
+                else:
+                    rng.setstate(state)
+                    rng.position = position
+        # Nothing to interpolate from across a jump in time
+        game.store_previous_positions()
+
+    def _restore_powerups(self, game, slots):
+        grid = game.grid
+        serials = slots[:, 1].tolist()
+        powerups = game.powerups
+        # Usually the same power-ups as now, just elsewhere
+        if [pu.serial for pu in powerups] != serials:
+            for pu in powerups:
+                pu.kill(grid)
+            powerups = [FallingGate(GATE_TYPES[int(gate)], 0, int(serial))
+                        for gate, serial in slots[:, :2].tolist()]
+            game.powerups = powerups
+        for pu, (_, _, x, y, original_y, glow) in zip(powerups, slots.tolist()):
+            pu.rect.x = int(x)  # Spawned at an int and never moved sideways
+            pu.rect.y = y
+            pu.original_y = original_y
+            pu.glow_timer = glow
+            pu.rect.file_in(grid, pu)
+
+
+class StateRing:
+    """The states of a GameState at the end of each of its last `capacity` ticks.
+
+    Call capture() after every step(). restore(frame) puts the game back
+    as it was after that tick and forgets the states after it, which now
+    belong to a timeline that didn't happen.
+    """
+
+    def __init__(self, game, capacity=ROLLBACK_TICKS):
+        self.game = game
+        self.capacity = capacity
+        self.layout = StateLayout(game.branches)
+        self.states = np.zeros((capacity, self.layout.width))
+        # Frame held by each slot, -1 if none
+        self.frames = np.full(capacity, -1, dtype=np.int64)
+
+    def __contains__(self, frame):
+        return frame >= 0 and self.frames[frame % self.capacity] == frame
+
+    @property
+    def oldest(self):
+        held = self.frames[self.frames >= 0]
+        return int(held.min()) if len(held) else None
+
+    def capture(self):
+        frame = self.game.frame
+        slot = frame % self.capacity
+        self.layout.capture(self.game, self.states[slot])
+        self.frames[slot] = frame
+
+    def restore(self, frame):
+        if frame not in self:
+            raise KeyError(f"frame {frame} is not in the ring")
+        self.layout.restore(self.game, self.states[frame % self.capacity])
+        self.frames[self.frames > frame] = -1
+
+    def rewind(self, ticks):
+        """Go back `ticks` ticks from the current frame"""
+        self.restore(self.game.frame - ticks)
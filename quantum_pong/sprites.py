@@ -0,0 +1,103 @@
+import math
+from collections import OrderedDict
+
+import pygame
+
+from .constants import (
+    BALL_RADIUS, PADDLE_WIDTH, PADDLE_HEIGHT, POWERUP_SIZE, WHITE, BLUE, RED,
+    NEON_CYAN, NEON_PINK,
+)
+
+# Alpha values are snapped to multiples of this before lookup
+ALPHA_STEP = 16
+
+
+def quantize_alpha(alpha):
+    alpha = int(alpha)
+    if alpha >= 255:
+        return 255
+    if alpha <= 0:
+        return 0
+    return min(255, (alpha + ALPHA_STEP // 2) // ALPHA_STEP * ALPHA_STEP)
+
+
+class SpriteCache:
+    """Bounded LRU of pre-rendered alpha surfaces shared by every draw call.
+
+    Keys are (shape, size, rgb, quantized alpha) tuples, so a glow, trail dot
+    or particle of a given look is rasterized once and then only blitted.
+    `allocations` counts surfaces actually created, which is what the
+    profiler and benchmarks report per frame.
+    """
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.allocations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, build):
+        """Return the cached surface for key, calling build() on a miss"""
+        entries = self._entries
+        surface = entries.get(key)
+        if surface is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        self.allocations += 1
+        surface = build()
+        entries[key] = surface
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return surface
+
+    def circle(self, radius, color, alpha=255):
+        """Filled circle centered in a (2r x 2r) surface; radius snaps to 0.5 px"""
+        radius = round(radius * 2) / 2
+        rgb = tuple(color[:3])
+        alpha = quantize_alpha(alpha)
+
+        def build():
+            side = max(1, math.ceil(radius * 2))
+            s = pygame.Surface((side, side), pygame.SRCALPHA)
+            pygame.draw.circle(s, (*rgb, alpha), (radius, radius), radius)
+            return s
+
+        return self.get(("circle", radius, rgb, alpha), build)
+
+    def rect(self, width, height, color, alpha=255):
+        """Solid translucent rectangle"""
+        rgb = tuple(color[:3])
+        alpha = quantize_alpha(alpha)
+
+        def build():
+            s = pygame.Surface((width, height), pygame.SRCALPHA)
+            s.fill((*rgb, alpha))
+            return s
+
+        return self.get(("rect", width, height, rgb, alpha), build)
+
+    def prewarm(self):
+        """Render the sprites every frame needs before the first frame"""
+        # Ball glows (2 layers) for both superposition colors
+        for color in (NEON_CYAN, NEON_PINK):
+            for i in range(2):
+                self.circle(BALL_RADIUS + i * 4, color, 80 - i * 30)
+
+        # Trail dots: 8 positions fading in size and alpha
+        for color in (NEON_CYAN, NEON_PINK, BLUE, RED):
+            for length in range(1, 9):
+                for i in range(length):
+                    size = int(BALL_RADIUS * (i / length))
+                    if size > 0:
+                        self.circle(size, color, 255 * (i / length))
+
+        # Paddle glows and power-up glow
+        for color in (NEON_CYAN, NEON_PINK):
+            self.rect(PADDLE_WIDTH + 6, PADDLE_HEIGHT + 6, color, 50)
+        self.rect(POWERUP_SIZE, POWERUP_SIZE, WHITE, 30)
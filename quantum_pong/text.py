@@ -0,0 +1,33 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """Keyed cache of rendered text surfaces.
+
+    The HUD, messages and ball labels repeat the same few strings for
+    hundreds of frames, so each (font, text, color) is rasterized once and
+    reused until it falls out of the LRU. `renders` counts real
+    font.render() calls.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.renders = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def render(self, font, text, color, antialias=True):
+        key = (id(font), text, color, antialias)
+        entries = self._entries
+        surface = entries.get(key)
+        if surface is not None:
+            entries.move_to_end(key)
+            return surface
+        self.renders += 1
+        surface = font.render(text, antialias, color)
+        entries[key] = surface
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return surface
@@ -0,0 +1,283 @@
+"""Parallel AI-vs-AI tournaments over a grid of balance parameters.
+
+Every combination of the given parameter values is one configuration, and
+each configuration plays --matches headless matches. In each match the
+tracking AI from quantum_pong.ai, with a reaction delay, plays the
+built-in opponent. Matches are spread over a process pool, and each
+match's stats are written as soon as they arrive. A .parquet output
+(needs pyarrow, and the default when it is installed) is written in row
+groups; anything else is written as CSV.
+
+    python -m quantum_pong.tournament -p base_speed=6,7,8 -p jerk_duration=10,20 \\
+        --matches 200 --out sweep.parquet
+
+Match i of every configuration uses seed --seed + i, so configurations
+are compared on the same serves, drops and measurement outcomes.
+"""
+import argparse
+import csv
+import importlib.util
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from .ai import DelayedTracker
+from .simulation import GameState, TUNABLE, PLAYING
+
+DEFAULT_POINTS = 5
+DEFAULT_MAX_SECONDS = 300
+DEFAULT_TICK_RATE = 60
+DEFAULT_REACTION = 0.2
+
+# Rows buffered before a parquet row group or CSV flush
+WRITE_BATCH = 512
+
+STAT_COLUMNS = (
+    "player_score", "opponent_score", "seconds", "rallies", "mean_rally_s", "max_rally_s",
+    "paddle_hits", "paddle_collapses", "timeout_collapses", "gates_x", "gates_z", "gates_h",
+    "powerup_gates", "z_noise_flips",
+)
+
+
+def play_match(params, seed, tick_rate=DEFAULT_TICK_RATE, points=DEFAULT_POINTS,
+               max_seconds=DEFAULT_MAX_SECONDS, reaction=DEFAULT_REACTION):
+    """Play one AI-vs-AI match to `points` (or the time limit) and return its stats"""
+    game = GameState(seed=seed, tick_rate=tick_rate, **params)
+    player = DelayedTracker(round(reaction * tick_rate))
+    stats = dict.fromkeys(STAT_COLUMNS, 0)
+    rally_ticks = []
+    rally = 0
+    max_ticks = int(max_seconds * tick_rate)
+    step = game.step
+
+    while game.frame < max_ticks and game.player_score < points and game.opponent_score < points:
+        events = step(player(game))
+        if game.phase == PLAYING:
+            rally += 1
+        for event in events:
+            kind = event[0]
+            if kind == "paddle_hit":
+                stats["paddle_hits"] += 1
+            elif kind == "collapse":
+                stats["paddle_collapses" if event[2] == "paddle" else "timeout_collapses"] += 1
+            elif kind == "gate":
+                stats["gates_" + event[1].lower()] += 1
+                if event[2] == "powerup":
+                    stats["powerup_gates"] += 1
+            elif kind == "z_noise":
+                stats["z_noise_flips"] += 1
+            elif kind == "score":
+                rally_ticks.append(rally)
+                rally = 0
+
+    stats["player_score"] = game.player_score
+    stats["opponent_score"] = game.opponent_score
+    stats["seconds"] = game.frame / tick_rate
+    stats["rallies"] = len(rally_ticks)
+    stats["mean_rally_s"] = sum(rally_ticks) / len(rally_ticks) / tick_rate if rally_ticks else 0.0
+    # The rally cut off by the time limit still counts towards the longest
+    stats["max_rally_s"] = max(rally_ticks + [rally]) / tick_rate
+    return stats
+
+
+def _play(task):
+    config, match, params, seed, options = task
+    row = {"config": config, "match": match, "seed": seed}
+    row.update(params)
+    row.update(play_match(params, seed, **options))
+    return row
+
+
+def parse_values(text):
+    """'6,7,8', a start:stop:step range (stop inclusive) or 'easy,hard' -> list of values"""
+    try:
+        if ":" in text:
+            start, stop, step = (float(part) for part in text.split(":"))
+            count = int(round((stop - start) / step)) + 1
+            values = [start + i * step for i in range(count)]
+        else:
+            values = [float(part) for part in text.split(",")]
+    except ValueError:
+        # Names, such as ai_level=easy,hard
+        return [part.strip() for part in text.split(",")]
+    # Keep whole numbers as ints so the columns read like the constants
+    if all(value.is_integer() for value in values):
+        return [int(value) for value in values]
+    return values
+
+
+def build_grid(param_args, grid_file=None):
+    """{name: [values]} from -p NAME=VALUES options and an optional JSON file"""
+    grid = {}
+    if grid_file:
+        with open(grid_file) as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, dict):
+            raise ValueError(f"{grid_file} must hold a JSON object of {{name: [values]}}")
+        for name, values in loaded.items():
+            if not isinstance(values, list) or not values:
+                raise ValueError(f"{name} in {grid_file} needs a non-empty list of values, "
+                                 f"not {values!r}")
+        grid.update(loaded)
+    for arg in param_args:
+        name, _, values = arg.partition("=")
+        grid[name.strip()] = parse_values(values)
+    unknown = set(grid) - set(TUNABLE)
+    if unknown:
+        raise ValueError(f"unknown parameter(s) {', '.join(sorted(unknown))}; "
+                         f"choose from {', '.join(TUNABLE)}")
+    check_grid(grid)
+    return grid
+
+
+def check_grid(grid):
+    """Raise ValueError for any value a GameState wouldn't take, before a match is played"""
+    for name, values in grid.items():
+        for value in values:
+            number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if isinstance(TUNABLE[name], (int, float)) and not number:
+                raise ValueError(f"{name} needs numbers, not {value!r}")
+            try:
+                GameState(seed=0, **{name: value})
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"bad {name} value {value!r}: {e}") from None
+
+
+def configurations(grid):
+    """Every combination of the grid's values, as {name: value} dicts"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+class CsvSink:
+    def __init__(self, path, columns):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=columns)
+        self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    def __init__(self, path, columns):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Writing .parquet needs pyarrow (pip install pyarrow); use a .csv path instead")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._path = path
+        self._columns = columns
+        self._writer = None
+
+    def write(self, rows):
+        table = self._pa.Table.from_pylist(
+            rows, schema=self._writer.schema if self._writer else None)
+        if self._writer is None:
+            table = table.select(self._columns)
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def have_pyarrow():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def open_sink(path, columns):
+    return (ParquetSink if path.endswith(".parquet") else CsvSink)(path, columns)
+
+
+def run_tournament(grid, matches, out, workers=None, seed=0, options=None, progress=None):
+    """Play every configuration `matches` times across a process pool.
+
+    Rows are written to `out` as they complete, in completion order.
+    Returns the number of matches played.
+    """
+    configs = configurations(grid)
+    options = options or {}
+    tasks = [(config, match, params, seed + match, options)
+             for config, params in enumerate(configs) for match in range(matches)]
+    columns = ["config", "match", "seed"] + list(grid) + list(STAT_COLUMNS)
+    workers = workers or os.cpu_count() or 1
+    # Big enough chunks to amortize IPC, small enough to balance the tail
+    chunksize = max(1, len(tasks) // (workers * 32))
+
+    sink = open_sink(out, columns)
+    done = 0
+    batch = []
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            for row in pool.imap_unordered(_play, tasks, chunksize):
+                batch.append(row)
+                done += 1
+                if len(batch) >= WRITE_BATCH:
+                    sink.write(batch)
+                    batch = []
+                    if progress:
+                        progress(done, len(tasks))
+        if batch:
+            sink.write(batch)
+    finally:
+        sink.close()
+    if progress:
+        progress(done, len(tasks))
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quantum_pong.tournament",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("-p", "--param", action="append", default=[], metavar="NAME=VALUES",
+                        help=f"values to sweep, e.g. base_speed=6,7,8 or z_noise_interval=120:360:60; "
+                             f"NAME is one of {', '.join(TUNABLE)}")
+    parser.add_argument("--grid", help="JSON file of {name: [values]}")
+    parser.add_argument("--matches", type=int, default=100, help="matches per configuration")
+    parser.add_argument("--points", type=int, default=DEFAULT_POINTS, help="points that win a match")
+    parser.add_argument("--max-seconds", type=float, default=DEFAULT_MAX_SECONDS,
+                        help="game-time limit per match")
+    parser.add_argument("--reaction", type=float, default=DEFAULT_REACTION,
+                        help="reaction time of the player AI in seconds")
+    parser.add_argument("--tick-rate", type=int, default=DEFAULT_TICK_RATE, help="simulation ticks per second")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of match 0 of every configuration")
+    parser.add_argument("--out", help=".parquet or .csv results file (default: sweep.parquet, "
+                                      "or sweep.csv without pyarrow)")
+    args = parser.parse_args(argv)
+    if args.out is None:
+        args.out = "sweep.parquet" if have_pyarrow() else "sweep.csv"
+
+    try:
+        grid = build_grid(args.param, args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+    options = {"tick_rate": args.tick_rate, "points": args.points, "max_seconds": args.max_seconds,
+               "reaction": args.reaction}
+    total = len(configurations(grid)) * args.matches
+    print(f"{len(configurations(grid))} configurations x {args.matches} matches = {total} matches")
+
+    start = time.perf_counter()
+
+    def progress(done, total):
+        elapsed = time.perf_counter() - start
+        print(f"\r{done}/{total} matches, {done / max(elapsed, 1e-9):.1f}/s", end="", flush=True)
+
+    run_tournament(grid, args.matches, args.out, args.workers, args.seed, options, progress)
+    print(f"\nResults written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+import numpy as np
+
+from quantum_pong.particles import ParticlePool
+
+WHITE = (255, 255, 255)
+
+
+def test_overflowing_spawn_fills_the_pool_with_unique_slots():
+    pool = ParticlePool(32, rng=np.random.default_rng(1))
+    pool.emit(10, 10, WHITE, count=20)
+    # Slots 0-4 come free again, so the next spawn is partly from the free
+    # stack and partly stolen from live particles
+    pool.lifetime[:5] = 0
+    pool.update()
+    assert len(pool) == 15
+
+    slots = pool._take_slots(25)
+    assert len(slots) == 25
+    assert len(np.unique(slots)) == 25
+
+
+def test_overflowing_emit_keeps_every_particle():
+    pool = ParticlePool(32, rng=np.random.default_rng(1))
+    pool.emit(10, 10, WHITE, count=20)
+    pool.lifetime[:5] = 0
+    pool.update()
+
+    pool.emit(50, 50, WHITE, count=25)
+    assert len(pool) == 32
+    assert pool.alive.sum() == 32
+    # All 25 new particles landed, at the new emitter
+    assert (pool.x == 50).sum() == 25
+
+
+def test_full_pool_recycles_round_robin():
+    pool = ParticlePool(8, rng=np.random.default_rng(1))
+    pool.emit(0, 0, WHITE, count=8)
+    first = pool._take_slots(3)
+    second = pool._take_slots(3)
+    assert first.tolist() == [0, 1, 2]
+    assert second.tolist() == [3, 4, 5]
+    assert len(pool) == 8
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from quantum_pong.qubits import GATES, QubitRegister, ry
+
+P0 = np.diag([1, 0]).astype(complex)
+P1 = np.diag([0, 1]).astype(complex)
+
+
+def dense(n, factors):
+    """2**n x 2**n operator with factors[qubit] on those qubits, highest qubit first"""
+    op = np.ones((1, 1), dtype=complex)
+    for qubit in reversed(range(n)):
+        op = np.kron(op, factors.get(qubit, GATES["I"]))
+    return op
+
+
+def random_register(n, seed):
+    rng = np.random.default_rng(seed)
+    reg = QubitRegister(n)
+    state = rng.normal(size=2 ** n) + 1j * rng.normal(size=2 ** n)
+    reg.state[:] = state / np.linalg.norm(state)
+    return reg
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4])
+@pytest.mark.parametrize("gate", ["X", "Y", "Z", "H", "S", "T", "I", "ry"])
+def test_apply_matches_dense(n, gate):
+    matrix = ry(0.7) if gate == "ry" else GATES[gate]
+    for qubit in range(n):
+        reg = random_register(n, qubit)
+        expected = dense(n, {qubit: matrix}) @ reg.state
+        reg.apply(matrix if gate == "ry" else gate, qubit)
+        np.testing.assert_allclose(reg.state, expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("n", [2, 3, 4])
+@pytest.mark.parametrize("method, gate", [("cnot", "X"), ("cz", "Z")])
+def test_controlled_matches_dense(n, method, gate):
+    for control in range(n):
+        for target in range(n):
+            if control == target:
+                continue
+            reg = random_register(n, control * n + target)
+            op = dense(n, {control: P0}) + dense(n, {control: P1, target: GATES[gate]})
+            expected = op @ reg.state
+            getattr(reg, method)(control, target)
+            np.testing.assert_allclose(reg.state, expected, atol=1e-12)
+
+
+def test_cnot_on_two_qubit_basis_states():
+    mapped = []
+    for index in range(4):
+        reg = QubitRegister(2)
+        reg.state[:] = 0
+        reg.state[index] = 1
+        reg.cnot(0, 1)
+        mapped.append(int(np.argmax(np.abs(reg.state))))
+    assert mapped == [0, 3, 2, 1]
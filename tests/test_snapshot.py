@@ -0,0 +1,54 @@
+import pytest
+
+from quantum_pong.ai import track_ball
+from quantum_pong.constants import INPUT_H, INPUT_X
+from quantum_pong.replay import state_digest
+from quantum_pong.simulation import GameState
+from quantum_pong.snapshot import StateLayout, StateRing
+
+
+def play(game, ticks):
+    for _ in range(ticks):
+        inputs = track_ball(game)
+        if game.frame % 300 == 150:
+            inputs |= INPUT_H
+        elif game.frame % 700 == 500:
+            inputs |= INPUT_X
+        game.step(inputs)
+
+
+@pytest.mark.parametrize("ticks", [0, 1, 37, 400, 2500])
+def test_restore_gives_back_captured_digest(ticks):
+    game = GameState(seed=7)
+    play(game, ticks)
+    layout = StateLayout(game.branches)
+    row = layout.capture(game)
+    digest = state_digest(game)
+
+    play(game, 300)
+    layout.restore(game, row)
+    assert state_digest(game) == digest
+
+
+def test_initial_paddles_stay_ints():
+    game = GameState(seed=7)
+    layout = StateLayout(game.branches)
+    row = layout.capture(game)
+    layout.restore(game, row)
+    assert game.player.y.__class__ is int
+    assert game.opponent.y.__class__ is int
+
+
+def test_rewind_plays_on_identically():
+    game = GameState(seed=11)
+    ring = StateRing(game)
+    expected = {}
+    for _ in range(600):
+        play(game, 1)
+        ring.capture()
+        expected[game.frame] = state_digest(game)
+
+    ring.rewind(50)
+    assert state_digest(game) == expected[game.frame]
+    play(game, 50)
+    assert state_digest(game) == expected[600]